@@ -0,0 +1,68 @@
+import argparse
+import sys
+import time
+
+import chess
+
+# a deterministic UCI engine stand-in: answers every search after a fixed delay
+# with captures first, then moves in uci order, scored by material
+
+VALUES = {chess.PAWN: 100, chess.KNIGHT: 300, chess.BISHOP: 300, chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+
+def material(board):
+    score = 0
+    for piece in board.piece_map().values():
+        score += VALUES[piece.piece_type] if piece.color == board.turn else -VALUES[piece.piece_type]
+    return score
+
+def ranked(board):
+    def key(move):
+        victim = board.piece_at(move.to_square)
+        return (-(VALUES[victim.piece_type] if victim else 0), move.uci())
+    return sorted(board.legal_moves, key=key)
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake UCI engine for benchmarks')
+    parser.add_argument('--latency', type=float, default=0.0, help='milliseconds per search')
+    args = parser.parse_args()
+
+    board = chess.Board()
+    multipv = 1
+    for line in sys.stdin:
+        parts = line.split()
+        if not parts:
+            continue
+        cmd = parts[0]
+        if cmd == 'uci':
+            print('id name FakeUCI')
+            print('option name MultiPV type spin default 1 min 1 max 500')
+            print('option name Skill Level type spin default 20 min 0 max 20')
+            print('uciok')
+        elif cmd == 'isready':
+            print('readyok')
+        elif cmd == 'setoption' and 'MultiPV' in parts:
+            multipv = int(parts[-1])
+        elif cmd == 'position':
+            moves = parts.index('moves') if 'moves' in parts else len(parts)
+            board = chess.Board() if parts[1] == 'startpos' else chess.Board(' '.join(parts[2:moves]))
+            for uci in parts[moves + 1:]:
+                board.push_uci(uci)
+        elif cmd == 'go':
+            time.sleep(args.latency / 1000)
+            moves = ranked(board)
+            if not moves:
+                print('info depth 0 score mate 0' if board.is_check() else 'info depth 0 score cp 0')
+                print('bestmove (none)')
+            else:
+                for i, move in enumerate(moves[:multipv], 1):
+                    board.push(move)
+                    score = -material(board)
+                    board.pop()
+                    print(f'info depth 12 multipv {i} score cp {score} nodes 1000 pv {move.uci()}')
+                print(f'bestmove {moves[0].uci()}')
+        elif cmd == 'quit':
+            break
+        sys.stdout.flush()
+
+if __name__ == '__main__':
+    main()
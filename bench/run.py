@@ -0,0 +1,206 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import chess
+
+from core import Board, Square, Move
+from perft import POSITIONS
+
+FAKE_UCI = os.path.join(ROOT, 'bench', 'fake_uci.py')
+
+# a fixed game for the move and fen benchmarks, with captures, en passant and castling
+GAME = ('e2e4 d7d5 e4d5 g8f6 f1b5 c8d7 b5d7 b8d7 g1f3 e7e5 d5e6 f8d6 e1g1 e8g8 e6d7 d8d7 '
+        'd2d4 f8e8 c1g5 h7h6 g5f6 g7f6').split()
+
+def timed(fn, repeat=5, number=1):
+    # best of `repeat` runs of `number` calls, in microseconds per call
+    runs = []
+    for i in range(repeat):
+        t = time.perf_counter()
+        for j in range(number):
+            fn()
+        runs.append((time.perf_counter() - t) / number * 1e6)
+    return {"best_us": round(min(runs), 2), "median_us": round(sorted(runs)[len(runs) // 2], 2),
+            "repeat": repeat, "number": number}
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda p: round(samples[min(len(samples) - 1, int(len(samples) * p / 100))] * 1000, 2)
+    return {"count": len(samples), "p50_ms": pick(50), "p90_ms": pick(90), "p99_ms": pick(99),
+            "max_ms": round(samples[-1] * 1000, 2)}
+
+def play(board, uci):
+    initial = Square.at(8 - int(uci[1]), ord(uci[0]) - ord('a'))
+    final = Square.at(8 - int(uci[3]), ord(uci[2]) - ord('a'))
+    piece = board.squares[initial.row][initial.col].piece
+    board.move(piece, Move(initial, final))
+
+# board
+
+def bench_board(results):
+    boards = [Board(fen) for fen, counts in POSITIONS.values()]
+
+    def calc_moves():
+        for board in boards:
+            color = 'white' if board.core.turn == 0 else 'black'
+            for row, col in board.pieces[color]:
+                piece = board.squares[row][col].piece
+                piece.clear_moves()
+                board.calc_moves(piece, row, col)
+    n = sum(len(board.pieces['white' if board.core.turn == 0 else 'black']) for board in boards)
+    results["board.calc_moves"] = dict(timed(calc_moves, number=20), calls=n)
+
+    checks = [(board, board.squares[m.initial.row][m.initial.col].piece, m) for board in boards for m in board.legal_moves()]
+    def in_check():
+        for board, piece, move in checks:
+            board.in_check(piece, move)
+    results["board.in_check"] = dict(timed(in_check, number=20), calls=len(checks))
+
+    results["board.new"] = timed(Board, number=200)
+
+    def replay():
+        board = Board()
+        for uci in GAME:
+            play(board, uci)
+    results["board.move"] = dict(timed(replay, number=20), calls=len(GAME))
+
+    # Board.fen rebuilds only the rows the last move touched, time both ends
+    board = Board()
+    position = chess.Board()
+    for uci in GAME:
+        play(board, uci)
+        position.push_uci(uci)
+    def fen_full():
+        board.core.ranks = [None] * 8
+        board.fen()
+    results["fen.board_full"] = timed(fen_full, number=10000)
+    results["fen.board_cached"] = timed(board.fen, number=10000)
+    results["fen.python_chess"] = timed(position.fen, number=10000)
+
+# rendering
+
+def bench_render(results):
+    import pygame
+    from const import WIDTH, HEIGHT
+    from assets import Assets
+    from game import Game
+    from renderer import Renderer
+
+    os.chdir(ROOT)
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH + 300, HEIGHT))
+    Assets.preload()
+    game = Game()
+    renderer = Renderer(game, screen)
+    for uci in GAME[:6]:
+        play(game.board, uci)
+    game.set_hover(4, 4)
+    piece = game.board.squares[7][6].piece
+    piece.moves = game.board.moves_at(7, 6)
+    game.dragger.drag_piece(piece)
+
+    for method in ('show_bg', 'show_last_move', 'show_moves', 'show_pieces', 'show_hover'):
+        results[f"render.{method}"] = timed(lambda: getattr(game, method)(screen), number=50)
+
+    def frame():
+        renderer.mark_all()
+        renderer.update()
+    results["render.frame_full"] = timed(frame, number=50)
+
+    def frame_square():
+        renderer.mark_square(4, 4)
+        renderer.update()
+    results["render.frame_square"] = timed(frame_square, number=50)
+    game.dragger.undrag_piece()
+
+# engine pipeline: the GUI's worker thread against the fake engine
+
+def bench_engine(results, latency, plies):
+    import pygame
+    from engine_worker import EngineWorker, ENGINE_EVENT
+
+    pygame.init()
+    worker = EngineWorker([sys.executable, FAKE_UCI, '--latency', str(latency)], cache_path=':memory:')
+    worker.start()
+
+    position = chess.Board()
+    latency_by_kind = {'review': [], 'ai': []}
+    start = time.perf_counter()
+    for ply in range(plies):
+        if position.is_game_over():
+            break
+        move = sorted(position.legal_moves, key=lambda m: m.uci())[ply % position.legal_moves.count()]
+        fen_before = position.fen()
+        position.push(move)
+
+        t = time.perf_counter()
+        worker.review(fen_before, move.uci(), time.time())
+        worker.ai_move(position.fen())
+        pending = {'review': t, 'ai': t}
+        while pending:
+            event = pygame.event.wait(5000)
+            if event.type != ENGINE_EVENT:
+                if event.type == pygame.NOEVENT:
+                    raise RuntimeError('engine worker timed out')
+                continue
+            if 'error' in event.result:
+                raise RuntimeError(event.result['error'])
+            latency_by_kind[event.kind].append(time.perf_counter() - pending.pop(event.kind))
+            if event.kind == 'ai':
+                position.push_uci(event.result['uci'])
+    elapsed = time.perf_counter() - start
+
+    worker.stop()
+    worker.join()
+    results["engine.review"] = percentiles(latency_by_kind['review'])
+    results["engine.ai_move"] = percentiles(latency_by_kind['ai'])
+    results["engine.throughput"] = {"latency_ms": latency, "plies": len(latency_by_kind['ai']),
+                                    "plies_per_s": round(len(latency_by_kind['ai']) / elapsed, 2)}
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the board, rendering and engine pipeline')
+    parser.add_argument('-o', '--output', default='bench.json')
+    parser.add_argument('--only', default='board,render,engine', help='comma separated groups')
+    parser.add_argument('--latency', type=float, default=20.0, help='fake engine milliseconds per search')
+    parser.add_argument('--plies', type=int, default=20)
+    args = parser.parse_args()
+    groups = args.only.split(',')
+    # rendering loads assets relative to the repo root
+    output = os.path.abspath(args.output)
+
+    results = {}
+    if 'board' in groups:
+        bench_board(results)
+    if 'render' in groups:
+        bench_render(results)
+    if 'engine' in groups:
+        bench_engine(results, args.latency, args.plies)
+
+    report = {"commit": commit(), "python": platform.python_version(), "timestamp": int(time.time()),
+              "results": results}
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    for name, result in results.items():
+        print(f"[BENCH] {name}: {result}")
+
+if __name__ == '__main__':
+    main()
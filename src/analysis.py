@@ -0,0 +1,165 @@
+import time
+
+import chess
+import chess.engine
+
+from analysis_cache import AnalysisCache, limit_key
+from search import Searcher, MATE, MAX_PLY
+from core.bitboard import uci
+
+ANALYSIS_LIMIT = chess.engine.Limit(depth=12)
+MULTIPV = 1
+MATE_SCORE = 10000
+NATIVE_TIME = 1.0
+
+def classify(diff):
+    if diff >= 50:
+        return "✅ Juda yaxshi yurish!"
+    elif diff >= -20:
+        return "ℹ️ Yaxshi, ammo mukammal emas."
+    elif diff >= -100:
+        return "⚠️ Zaif yurish."
+    else:
+        return "❌ Katta xatolik."
+
+def classify_tablebase(before, after):
+    # exact scores of the mover, only a worse result is a mistake, a slower win is not
+    if after == before:
+        return "✅ Juda yaxshi yurish!"
+    if (after > 0) == (before > 0) and (after < 0) == (before < 0):
+        return "ℹ️ Yaxshi, ammo mukammal emas."
+    return "❌ Katta xatolik."
+
+class Analyzer:
+
+    def __init__(self, engine, cache=None, limit=ANALYSIS_LIMIT, multipv=MULTIPV, book=None, tablebase=None):
+        self.engine = engine
+        # an OpeningBook, asked before the engine while the game is still in it
+        self.book = book
+        # a Tablebase, exact answers for endgames it has the files for
+        self.tablebase = tablebase
+        # also carries the position after ply N over as the position before ply N + 1
+        self.cache = cache if cache is not None else AnalysisCache(':memory:')
+        self.limit = limit
+        self.multipv = multipv
+
+    def probe(self, board):
+        return self.tablebase.analyse(board) if self.tablebase else None
+
+    def analyse(self, board):
+        result = self.probe(board)
+        if result is not None:
+            return result
+
+        key = board.epd()
+        kind, amount = limit_key(self.limit)
+        result = self.cache.get(key, kind, amount, self.multipv)
+        if result is not None:
+            return result
+
+        infos = self.engine.analyse(board, self.limit, multipv=self.multipv)
+        lines = [(info['score'].relative.score(mate_score=MATE_SCORE), info.get('pv', [])) for info in infos]
+        result = {"score": lines[0][0], "pv": lines[0][1], "lines": lines}
+
+        if kind == 'depth':
+            amount = max(amount, infos[0].get('depth', 0))
+        self.cache.put(key, kind, amount, self.multipv, result)
+        return result
+
+    def best_move_suggestion(self, board):
+        try:
+            move = self.book.best(board) if self.book else None
+            if move:
+                return board.san(move)
+            pv = self.analyse(board)["pv"]
+            return board.san(pv[0]) if pv else "?"
+        except Exception as e:
+            print("[XATOLIK] Eng yaxshi yurishni aniqlashda xato:", e)
+            return "?"
+
+    def review_move(self, fen_before, uci, start_time):
+        user_board = chess.Board(fen_before)
+        chess_move = chess.Move.from_uci(uci)
+
+        if chess_move not in user_board.legal_moves:
+            raise ValueError("Illegal move")
+
+        pgn_move = user_board.san(chess_move)
+        if self.book and self.book.contains(user_board, chess_move):
+            best = self.best_move_suggestion(user_board)
+            user_board.push(chess_move)
+            return {"move": pgn_move, "uci": uci, "ply": user_board.ply(), "comment": "📖 Nazariy yurish.",
+                    "eval": None, "time": round(time.time() - start_time, 2), "suggestion": f"(Kitobda: {best})",
+                    "checkmate": False}
+
+        before = self.analyse(user_board)
+        best = self.best_move_suggestion(user_board)
+        user_board.push(chess_move)
+        after = self.analyse(user_board)
+
+        # both scores from the mover's point of view
+        eval_before = before["score"] or 0
+        eval_after = after["score"]
+        diff = -(eval_after or 0) - eval_before
+
+        if before.get("tablebase"):
+            # before scores every move by its own probe, the played move is scored the same way
+            comment = classify_tablebase(eval_before, -self.tablebase.score(user_board))
+        else:
+            comment = classify(diff)
+        duration = round(time.time() - start_time, 2)
+        return {"move": pgn_move, "uci": uci, "ply": user_board.ply(), "comment": comment, "eval": eval_after,
+                "time": duration,
+                "suggestion": f"(Eng yaxshisi: {best})", "checkmate": user_board.is_checkmate()}
+
+    def ai_move(self, fen):
+        sf_board = chess.Board(fen)
+        move = self.book.choice(sf_board) if self.book else None
+        comment = "📖 AI kitobdan yurdi"
+        if move is None:
+            analysis = self.analyse(sf_board)
+            if not analysis["pv"]:
+                raise ValueError("No move")
+            move = analysis["pv"][0]
+            comment = "♟️ AI yurdi"
+
+        uci_move = move.uci()
+        pgn_move = sf_board.san(move)
+        sf_board.push(move)
+        return {"move": pgn_move, "uci": uci_move, "ply": sf_board.ply(), "comment": f"{comment} ({uci_move})",
+                "suggestion": f"(Tavsiyasi: {pgn_move})", "checkmate": sf_board.is_checkmate(),
+                "fen_after": sf_board.fen()}
+
+    def prefetch(self, fen):
+        board = chess.Board(fen)
+        # a book position needs no search, the player's reply is most likely a book move too
+        if not board.is_game_over() and not (self.book and self.book.best(board)):
+            self.analyse(board)
+
+class NativeAnalyzer(Analyzer):
+
+    # same reviews and AI moves, searched in-process instead of by a UCI engine
+    def __init__(self, cache=None, time_limit=NATIVE_TIME, book=None, tablebase=None):
+        super().__init__(None, cache, chess.engine.Limit(time=time_limit), multipv=1, book=book,
+                         tablebase=tablebase)
+        self.searcher = Searcher()
+
+    def analyse(self, board):
+        result = self.probe(board)
+        if result is not None:
+            return result
+
+        key = board.epd()
+        result = self.cache.get(key, 'native', self.limit.time)
+        if result is not None:
+            return result
+
+        move, score, depth = self.searcher.search(board.fen(), self.limit.time)
+        if move is None:
+            score = -MATE_SCORE if board.is_checkmate() else 0
+        elif abs(score) >= MATE - MAX_PLY:
+            score = MATE_SCORE if score > 0 else -MATE_SCORE
+        pv = [chess.Move.from_uci(uci(move))] if move is not None else []
+        result = {"score": score, "pv": pv, "lines": [(score, pv)]}
+        self.cache.put(key, 'native', self.limit.time, 1, result)
+        return result
@@ -0,0 +1,88 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import chess
+
+ANALYSIS_CACHE_PATH = 'analysis_cache.db'
+
+def limit_key(limit):
+    # (kind, amount) of a chess.engine.Limit, a larger amount is a stronger search
+    if limit.depth is not None:
+        return 'depth', limit.depth
+    if limit.nodes is not None:
+        return 'nodes', limit.nodes
+    return 'time', limit.time
+
+class AnalysisCache:
+
+    def __init__(self, path=ANALYSIS_CACHE_PATH, size=4096):
+        self.size = size
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('''CREATE TABLE IF NOT EXISTS analysis (
+                               epd TEXT, kind TEXT, amount REAL, multipv INTEGER, result TEXT,
+                               PRIMARY KEY (epd, kind, multipv))''')
+        self.db.commit()
+
+    def get(self, epd, kind, amount, multipv=1):
+        key = (epd, kind, multipv)
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is None or entry[0] < amount:
+                # the deepest search with at least as many lines answers a shallower request,
+                # another process may have written a deeper one since this entry was read
+                row = self.db.execute('''SELECT amount, result FROM analysis
+                                         WHERE epd = ? AND kind = ? AND multipv >= ?
+                                         ORDER BY amount DESC LIMIT 1''', key).fetchone()
+                if row is None or (entry is not None and row[0] <= entry[0]):
+                    return None
+                entry = (row[0], self._decode(row[1]))
+                self._remember(key, entry)
+            else:
+                self.memory.move_to_end(key)
+
+        if entry[0] >= amount:
+            return entry[1]
+        return None
+
+    def put(self, epd, kind, amount, multipv, result):
+        with self.lock:
+            # a result with more lines also answers requests for fewer
+            for lines in range(1, multipv + 1):
+                entry = self.memory.get((epd, kind, lines))
+                if entry is None or entry[0] < amount:
+                    self._remember((epd, kind, lines), (amount, result))
+            # never let a shallower result replace a deeper one with the same lines on disk
+            self.db.execute('''INSERT INTO analysis VALUES (?, ?, ?, ?, ?)
+                               ON CONFLICT (epd, kind, multipv) DO UPDATE SET
+                                   amount = excluded.amount, result = excluded.result
+                               WHERE excluded.amount >= analysis.amount''',
+                            (epd, kind, amount, multipv, self._encode(result)))
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.size:
+            self.memory.popitem(last=False)
+
+    # results hold chess.Move objects in memory and uci strings on disk
+
+    def _encode(self, result):
+        data = dict(result)
+        data['pv'] = [move.uci() for move in result['pv']]
+        data['lines'] = [(score, [move.uci() for move in pv]) for score, pv in result['lines']]
+        return json.dumps(data)
+
+    def _decode(self, text):
+        data = json.loads(text)
+        data['pv'] = [chess.Move.from_uci(uci) for uci in data['pv']]
+        data['lines'] = [(score, [chess.Move.from_uci(uci) for uci in pv]) for score, pv in data['lines']]
+        return data
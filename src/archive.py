@@ -0,0 +1,107 @@
+import os
+import struct
+import sys
+from array import array
+
+# <path>.bin holds each game as uint16 moves followed by int16 evals, little endian.
+# <path>.idx holds one fixed record per game, so game n is a single seek away.
+INDEX = struct.Struct('<QI')
+NO_EVAL = -32768
+EVAL_LIMIT = 32767
+PROMOTIONS = ' nbrq'
+
+def encode_uci(uci):
+    # same layout as the core move codes: from | to << 6 | promotion << 12, 15 bits
+    frm = ord(uci[0]) - ord('a') + 8 * (int(uci[1]) - 1)
+    to = ord(uci[2]) - ord('a') + 8 * (int(uci[3]) - 1)
+    return frm | to << 6 | (PROMOTIONS.index(uci[4]) if len(uci) > 4 else 0) << 12
+
+def decode_uci(code):
+    frm, to, promotion = code & 63, code >> 6 & 63, code >> 12
+    uci = f"{'abcdefgh'[frm & 7]}{(frm >> 3) + 1}{'abcdefgh'[to & 7]}{(to >> 3) + 1}"
+    return uci + PROMOTIONS[promotion] if promotion else uci
+
+def encode_eval(score):
+    if score is None:
+        return NO_EVAL
+    return max(-EVAL_LIMIT, min(EVAL_LIMIT, int(score)))
+
+def _little(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+class ArchiveWriter:
+
+    def __init__(self, path):
+        self.path = path
+        self.data = open(path + '.bin', 'ab')
+        self.index = open(path + '.idx', 'ab')
+        self.games = self.index.tell() // INDEX.size
+
+    def add(self, moves, evals=()):
+        # moves as uci strings or move codes, evals in centipawns (None for none)
+        moves = array('H', (encode_uci(m) if isinstance(m, str) else m for m in moves))
+        evals = list(evals)
+        evals = array('h', (encode_eval(evals[i]) if i < len(evals) else NO_EVAL for i in range(len(moves))))
+        return self.add_packed(moves, evals)
+
+    def add_packed(self, moves, evals):
+        # arrays already in archive form, 'H' move codes and 'h' evals of the same length
+        offset = self.data.seek(0, os.SEEK_END)
+        self.data.write(_little(array('H', moves)).tobytes())
+        self.data.write(_little(array('h', evals)).tobytes())
+        # the index entry goes last, a game is only visible once its data is down
+        self.data.flush()
+        self.index.write(INDEX.pack(offset, len(moves)))
+        self.index.flush()
+        self.games += 1
+        return self.games - 1
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ArchiveReader:
+
+    def __init__(self, path):
+        self.data = open(path + '.bin', 'rb')
+        self.index = open(path + '.idx', 'rb')
+
+    def __len__(self):
+        return os.fstat(self.index.fileno()).st_size // INDEX.size
+
+    def __getitem__(self, n):
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(n)
+        self.index.seek(n * INDEX.size)
+        offset, plies = INDEX.unpack(self.index.read(INDEX.size))
+        self.data.seek(offset)
+        moves = _little(array('H', self.data.read(2 * plies)))
+        evals = _little(array('h', self.data.read(2 * plies)))
+        return list(moves), [None if e == NO_EVAL else e for e in evals]
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self[n]
+
+    def ucis(self, n):
+        return [decode_uci(code) for code in self[n][0]]
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,50 @@
+import pygame
+import os
+
+from sound import Sound
+
+class Assets:
+
+    # process-wide caches, they survive Game.reset
+
+    images = {}
+    sounds = {}
+    fonts = {}
+
+    COLORS = ['white', 'black']
+    NAMES = ['pawn', 'knight', 'bishop', 'rook', 'queen', 'king']
+    SIZES = [80, 128]
+
+    @classmethod
+    def preload(cls):
+        for color in cls.COLORS:
+            for name in cls.NAMES:
+                for size in cls.SIZES:
+                    cls.image(color, name, size)
+
+    @classmethod
+    def image(cls, color, name, size=80):
+        key = (color, name, size)
+        img = cls.images.get(key)
+        if img is None:
+            img = pygame.image.load(os.path.join(f'assets/images/imgs-{size}px/{color}_{name}.png'))
+            # converting needs a display mode, surfaces loaded before it stay unconverted
+            if pygame.display.get_surface():
+                img = img.convert_alpha()
+            cls.images[key] = img
+        return img
+
+    @classmethod
+    def sound(cls, path):
+        sound = cls.sounds.get(path)
+        if sound is None:
+            sound = cls.sounds[path] = Sound(path)
+        return sound
+
+    @classmethod
+    def font(cls, name, size, bold=False):
+        key = (name, size, bold)
+        font = cls.fonts.get(key)
+        if font is None:
+            font = cls.fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        return font
@@ -0,0 +1,123 @@
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from multiprocessing import Pool
+
+import chess
+import chess.engine
+import chess.pgn
+
+from analysis import Analyzer
+from analysis_cache import AnalysisCache, ANALYSIS_CACHE_PATH
+
+STOCKFISH_PATH = "/usr/games/stockfish"
+
+# one engine and analyzer per worker process
+
+_analyzer = None
+
+def _init_worker(engine_path, depth, cache_path):
+    global _analyzer
+    engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+    atexit.register(engine.quit)
+    cache = AnalysisCache(cache_path) if cache_path else None
+    _analyzer = Analyzer(engine, cache, limit=chess.engine.Limit(depth=depth))
+
+def _analyse_game(task):
+    index, fen, moves = task
+    board = chess.Board(fen)
+    records = []
+    try:
+        for uci in moves:
+            fen_before = board.fen()
+            result = _analyzer.review_move(fen_before, uci, time.time())
+            records.append({"game": index, "ply": result["ply"], "move": result["move"],
+                            "comment": result["comment"], "eval": result["eval"], "suggestion": result["suggestion"], "time": result["time"]})
+            board.push_uci(uci)
+    except Exception as e:
+        # the ply the failed move would have been, counted like review_move's
+        records.append({"game": index, "ply": board.ply() + 1, "error": str(e)})
+    return index, records
+
+# streaming input
+
+def read_games(path, skip=0):
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for i in range(skip):
+            if not chess.pgn.skip_game(f):
+                return
+        index = skip
+        while True:
+            game = chess.pgn.read_game(f)
+            if game is None:
+                return
+            board = game.board()
+            yield index, board.fen(), [move.uci() for move in game.mainline_moves()]
+            index += 1
+
+def _bounded(tasks, slots):
+    # Pool.imap drains its input eagerly, hold it back so big files stay on disk
+    for task in tasks:
+        slots.acquire()
+        yield task
+
+# checkpoint
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return {"games": 0, "offset": 0}
+    with open(path) as f:
+        return json.load(f)
+
+def save_checkpoint(path, games, offset):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({"games": games, "offset": offset}, f)
+    os.replace(tmp, path)
+
+def run(pgn_path, out_path, engine_path=STOCKFISH_PATH, workers=1, depth=12, cache_path=ANALYSIS_CACHE_PATH, resume=False):
+    checkpoint_path = out_path + '.checkpoint'
+    resume = resume and os.path.exists(out_path)
+    checkpoint = load_checkpoint(checkpoint_path) if resume else {"games": 0, "offset": 0}
+    games = checkpoint["games"]
+
+    out = open(out_path, 'r+' if resume else 'w', encoding='utf-8')
+    # drop records of a game that was half written when the last run stopped
+    out.seek(checkpoint["offset"])
+    out.truncate()
+
+    slots = threading.BoundedSemaphore(workers * 4)
+    start = time.time()
+    plies = 0
+    with Pool(workers, _init_worker, (engine_path, depth, cache_path)) as pool:
+        for index, records in pool.imap(_analyse_game, _bounded(read_games(pgn_path, games), slots)):
+            slots.release()
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+            games = index + 1
+            plies += len(records)
+            save_checkpoint(checkpoint_path, games, out.tell())
+            elapsed = time.time() - start
+            print(f"[INFO] {games} o'yin | {plies} yurish | {plies / max(elapsed, 1e-9):.1f} yurish/s")
+
+    out.close()
+    return games
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyse every move of a PGN file into JSON Lines')
+    parser.add_argument('pgn')
+    parser.add_argument('-o', '--output', default='analysis.jsonl')
+    parser.add_argument('--engine', default=STOCKFISH_PATH)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--depth', type=int, default=12)
+    parser.add_argument('--cache', default=ANALYSIS_CACHE_PATH, help="analysis cache file ('' to disable)")
+    parser.add_argument('--resume', action='store_true', help='continue from the last checkpoint')
+    args = parser.parse_args()
+    run(args.pgn, args.output, args.engine, args.workers, args.depth, args.cache, args.resume)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+import os
+import random
+
+import chess.polyglot
+
+BOOK_PATH = 'book.bin'
+
+class OpeningBook:
+
+    # python-chess maps the Polyglot file and bisects its sorted entries by Zobrist key
+    def __init__(self, path=BOOK_PATH, seed=None):
+        self.path = path
+        self.reader = chess.polyglot.open_reader(path)
+        self.random = random.Random(seed)
+
+    @classmethod
+    def open(cls, path=BOOK_PATH):
+        # None without a book, the engine then answers everything
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            book = cls(path)
+        except OSError as e:
+            print("[XATOLIK] Debyut kitobi ochilmadi:", e)
+            return None
+        print(f"[INFO] Debyut kitobi: {path}")
+        return book
+
+    def choice(self, board):
+        # weighted by the book, so the AI varies its openings
+        try:
+            return self.reader.weighted_choice(board, random=self.random).move
+        except IndexError:
+            return None
+
+    def best(self, board):
+        try:
+            return self.reader.find(board).move
+        except IndexError:
+            return None
+
+    def contains(self, board, move):
+        return any(entry.move == move for entry in self.reader.find_all(board))
+
+    def close(self):
+        self.reader.close()
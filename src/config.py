@@ -1,7 +1,6 @@
-import pygame
 import os
 
-from sound import Sound
+from assets import Assets
 from theme import Theme
 
 class Config:
@@ -11,10 +10,10 @@ class Config:
         self._add_themes()
         self.idx = 0
         self.theme = self.themes[self.idx]
-        self.font = pygame.font.SysFont('monospace', 18, bold=True)
-        self.move_sound = Sound(
+        self.font = Assets.font('monospace', 18, bold=True)
+        self.move_sound = Assets.sound(
             os.path.join('assets/sounds/move.wav'))
-        self.capture_sound = Sound(
+        self.capture_sound = Assets.sound(
             os.path.join('assets/sounds/capture.wav'))
 
     def change_theme(self):
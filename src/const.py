@@ -3,6 +3,8 @@ WIDTH = 800
 HEIGHT = 800
 
 # Board dimensions
-ROWS = 8
-COLS = 8
-SQSIZE = WIDTH // COLS
\ No newline at end of file
+from core.const import ROWS, COLS
+SQSIZE = WIDTH // COLS
+
+# Frame cap while a piece is dragged
+FPS = 60
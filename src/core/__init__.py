@@ -0,0 +1,6 @@
+from .const import ROWS, COLS
+from .square import Square
+from .move import Move
+from .piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from .bitboard import BitBoard, START_FEN
+from .board import Board
@@ -0,0 +1,39 @@
+from .const import *
+
+KNIGHT_STEPS = [(-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1)]
+KING_STEPS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+ROOK_DIRS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+BISHOP_DIRS = [(-1, 1), (-1, -1), (1, 1), (1, -1)]
+PAWN_STEPS = {'white': [(-1, -1), (-1, 1)], 'black': [(1, -1), (1, 1)]}
+
+def _in_range(row, col):
+    return 0 <= row < ROWS and 0 <= col < COLS
+
+def _steps(row, col, steps):
+    return [(row + dr, col + dc) for dr, dc in steps if _in_range(row + dr, col + dc)]
+
+def _ray(row, col, dr, dc):
+    ray = []
+    r, c = row + dr, col + dc
+    while _in_range(r, c):
+        ray.append((r, c))
+        r += dr
+        c += dc
+    return ray
+
+def _table(fn):
+    return [[fn(row, col) for col in range(COLS)] for row in range(ROWS)]
+
+# per-square target lists, built once at import
+
+KNIGHT = _table(lambda row, col: _steps(row, col, KNIGHT_STEPS))
+KING = _table(lambda row, col: _steps(row, col, KING_STEPS))
+
+# squares attacked by a pawn of the given color standing on (row, col)
+PAWN = {color: _table(lambda row, col, color=color: _steps(row, col, PAWN_STEPS[color]))
+        for color in PAWN_STEPS}
+
+# rays ordered outward from (row, col), one list per direction
+ROOK_RAYS = _table(lambda row, col: [_ray(row, col, dr, dc) for dr, dc in ROOK_DIRS])
+BISHOP_RAYS = _table(lambda row, col: [_ray(row, col, dr, dc) for dr, dc in BISHOP_DIRS])
+QUEEN_RAYS = _table(lambda row, col: ROOK_RAYS[row][col] + BISHOP_RAYS[row][col])
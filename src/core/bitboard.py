@@ -0,0 +1,469 @@
+import random
+from collections import OrderedDict
+
+from . import attacks
+from .const import *
+
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+COLORS = ['white', 'black']
+PIECE_NAMES = ['pawn', 'knight', 'bishop', 'rook', 'queen', 'king']
+FEN_CHARS = 'PNBRQKpnbrqk'
+
+CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ = 1, 2, 4, 8
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+FULL = (1 << 64) - 1
+RANK_1 = 0xFF
+RANK_3 = RANK_1 << 16
+RANK_6 = RANK_1 << 40
+RANK_8 = RANK_1 << 56
+
+# squares are numbered a1 = 0 ... h8 = 63, rows of Board.squares count from rank 8
+
+def square(row, col):
+    return (7 - row) * 8 + col
+
+def row_col(sq):
+    return 7 - (sq >> 3), sq & 7
+
+def square_name(sq):
+    return 'abcdefgh'[sq & 7] + str((sq >> 3) + 1)
+
+# moves are ints: from | to << 6 | promotion piece type << 12
+
+def encode(frm, to, promotion=0):
+    return frm | to << 6 | promotion << 12
+
+def uci(move):
+    s = square_name(move & 63) + square_name(move >> 6 & 63)
+    if move >> 12:
+        s += FEN_CHARS[6 + (move >> 12)]
+    return s
+
+def bits(mask):
+    while mask:
+        b = mask & -mask
+        yield b.bit_length() - 1
+        mask ^= b
+
+# attack masks derived from the per-square tables in attacks.py
+
+def _mask(targets):
+    m = 0
+    for r, c in targets:
+        m |= 1 << square(r, c)
+    return m
+
+DIRS = attacks.ROOK_DIRS + attacks.BISHOP_DIRS
+# a ray grows towards higher square numbers when the rank goes up, or along the rank to the right
+POSITIVE = [dc - 8 * dr > 0 for dr, dc in DIRS]
+ROOK_DIR_IDS = range(0, 4)
+BISHOP_DIR_IDS = range(4, 8)
+
+KNIGHT_BB = [0] * 64
+KING_BB = [0] * 64
+PAWN_BB = [[0] * 64, [0] * 64]
+RAY_BB = [[0] * 64 for d in DIRS]
+ROOK_BB = [0] * 64
+BISHOP_BB = [0] * 64
+BETWEEN = [[0] * 64 for sq in range(64)]
+LINE = [[0] * 64 for sq in range(64)]
+
+for _row in range(ROWS):
+    for _col in range(COLS):
+        _sq = square(_row, _col)
+        KNIGHT_BB[_sq] = _mask(attacks.KNIGHT[_row][_col])
+        KING_BB[_sq] = _mask(attacks.KING[_row][_col])
+        PAWN_BB[WHITE][_sq] = _mask(attacks.PAWN['white'][_row][_col])
+        PAWN_BB[BLACK][_sq] = _mask(attacks.PAWN['black'][_row][_col])
+        for _d, _ray in enumerate(attacks.ROOK_RAYS[_row][_col] + attacks.BISHOP_RAYS[_row][_col]):
+            RAY_BB[_d][_sq] = _mask(_ray)
+            _between = 0
+            for _r, _c in _ray:
+                _to = square(_r, _c)
+                BETWEEN[_sq][_to] = _between
+                _between |= 1 << _to
+        ROOK_BB[_sq] = RAY_BB[0][_sq] | RAY_BB[1][_sq] | RAY_BB[2][_sq] | RAY_BB[3][_sq]
+        BISHOP_BB[_sq] = RAY_BB[4][_sq] | RAY_BB[5][_sq] | RAY_BB[6][_sq] | RAY_BB[7][_sq]
+
+OPPOSITE = [DIRS.index((-dr, -dc)) for dr, dc in DIRS]
+
+for _sq in range(64):
+    for _d in range(len(DIRS)):
+        _line = RAY_BB[_d][_sq] | RAY_BB[OPPOSITE[_d]][_sq] | 1 << _sq
+        for _to in bits(RAY_BB[_d][_sq]):
+            LINE[_sq][_to] = _line
+
+# castling rights kept after a piece leaves or lands on a square
+CASTLE_KEEP = [15] * 64
+CASTLE_KEEP[0] = 15 ^ CASTLE_WQ
+CASTLE_KEEP[4] = 15 ^ (CASTLE_WK | CASTLE_WQ)
+CASTLE_KEEP[7] = 15 ^ CASTLE_WK
+CASTLE_KEEP[56] = 15 ^ CASTLE_BQ
+CASTLE_KEEP[60] = 15 ^ (CASTLE_BK | CASTLE_BQ)
+CASTLE_KEEP[63] = 15 ^ CASTLE_BK
+
+# zobrist keys, fixed seed so keys are stable between runs and processes
+_rng = random.Random(0x5EED)
+ZOBRIST_PIECES = [[_rng.getrandbits(64) for sq in range(64)] for piece in range(12)]
+ZOBRIST_TURN = _rng.getrandbits(64)
+ZOBRIST_CASTLING = [_rng.getrandbits(64) for rights in range(16)]
+ZOBRIST_EP = [_rng.getrandbits(64) for file in range(8)]
+
+MOVE_CACHE_SIZE = 4096
+
+def slider_attacks(sq, occ, dir_ids):
+    attacks = 0
+    for d in dir_ids:
+        ray = RAY_BB[d][sq]
+        blockers = ray & occ
+        if blockers:
+            if POSITIVE[d]:
+                b = (blockers & -blockers).bit_length() - 1
+            else:
+                b = blockers.bit_length() - 1
+            ray ^= RAY_BB[d][b]
+        attacks |= ray
+    return attacks
+
+def rook_attacks(sq, occ):
+    return slider_attacks(sq, occ, ROOK_DIR_IDS)
+
+def bishop_attacks(sq, occ):
+    return slider_attacks(sq, occ, BISHOP_DIR_IDS)
+
+
+class BitBoard:
+
+    def __init__(self, fen=START_FEN):
+        self.move_cache = OrderedDict()
+        self.set_fen(fen)
+
+    # fen
+
+    def set_fen(self, fen):
+        parts = fen.split()
+        self.bb = [0] * 12
+        self.occ = [0, 0]
+        self.mailbox = [-1] * 64
+        # placement text per row, rebuilt by fen() only for rows a move has touched
+        self.ranks = [None] * ROWS
+        self.key = 0
+        for row, text in enumerate(parts[0].split('/')):
+            col = 0
+            for ch in text:
+                if ch.isdigit():
+                    col += int(ch)
+                else:
+                    self._put(FEN_CHARS.index(ch), square(row, col))
+                    col += 1
+
+        self.turn = WHITE if len(parts) < 2 or parts[1] == 'w' else BLACK
+        rights = parts[2] if len(parts) > 2 else '-'
+        self.castling = 0
+        for ch, right in zip('KQkq', (CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ)):
+            if ch in rights:
+                self.castling |= right
+        ep = parts[3] if len(parts) > 3 else '-'
+        self.ep = -1 if ep == '-' else 'abcdefgh'.index(ep[0]) + 8 * (int(ep[1]) - 1)
+        self.halfmove = int(parts[4]) if len(parts) > 4 else 0
+        self.fullmove = int(parts[5]) if len(parts) > 5 else 1
+        self.history = []
+        self.key ^= ZOBRIST_CASTLING[self.castling] ^ self._ep_key()
+        if self.turn == BLACK:
+            self.key ^= ZOBRIST_TURN
+
+    # zobrist
+
+    def _ep_key(self):
+        # the en-passant file only counts when the side to move can actually capture there
+        if self.ep < 0 or not PAWN_BB[self.turn ^ 1][self.ep] & self.bb[self.turn * 6 + PAWN]:
+            return 0
+        return ZOBRIST_EP[self.ep & 7]
+
+    def is_repetition(self, count=3):
+        # only positions since the last capture or pawn move can repeat
+        seen = 1
+        history = self.history
+        for i in range(len(history) - 2, max(len(history) - self.halfmove, 0) - 1, -2):
+            if history[i][6] == self.key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def fen(self):
+        ranks = self.ranks
+        for row in range(ROWS):
+            if ranks[row] is None:
+                ranks[row] = self._rank_text(row)
+
+        rights = ''.join(ch for ch, right in zip('KQkq', (CASTLE_WK, CASTLE_WQ, CASTLE_BK, CASTLE_BQ))
+                         if self.castling & right) or '-'
+        ep = square_name(self.ep) if self.ep >= 0 else '-'
+        return f"{'/'.join(ranks)} {'wb'[self.turn]} {rights} {ep} {self.halfmove} {self.fullmove}"
+
+    def _rank_text(self, row):
+        text = ''
+        empty = 0
+        for col in range(COLS):
+            p = self.mailbox[square(row, col)]
+            if p < 0:
+                empty += 1
+                continue
+            if empty:
+                text += str(empty)
+                empty = 0
+            text += FEN_CHARS[p]
+        if empty:
+            text += str(empty)
+        return text
+
+    # attacks
+
+    def attackers(self, sq, by_color, occ=None):
+        if occ is None:
+            occ = self.occ[0] | self.occ[1]
+        bb = self.bb
+        base = by_color * 6
+        return ((KNIGHT_BB[sq] & bb[base + KNIGHT])
+                | (KING_BB[sq] & bb[base + KING])
+                | (PAWN_BB[by_color ^ 1][sq] & bb[base + PAWN])
+                | (rook_attacks(sq, occ) & (bb[base + ROOK] | bb[base + QUEEN]))
+                | (bishop_attacks(sq, occ) & (bb[base + BISHOP] | bb[base + QUEEN])))
+
+    def is_attacked(self, sq, by_color, occ=None):
+        if occ is None:
+            occ = self.occ[0] | self.occ[1]
+        bb = self.bb
+        base = by_color * 6
+        if KNIGHT_BB[sq] & bb[base + KNIGHT]: return True
+        if KING_BB[sq] & bb[base + KING]: return True
+        if PAWN_BB[by_color ^ 1][sq] & bb[base + PAWN]: return True
+        rq = bb[base + ROOK] | bb[base + QUEEN]
+        if rq & ROOK_BB[sq] and rook_attacks(sq, occ) & rq: return True
+        bq = bb[base + BISHOP] | bb[base + QUEEN]
+        if bq & BISHOP_BB[sq] and bishop_attacks(sq, occ) & bq: return True
+        return False
+
+    def king_square(self, color):
+        return self.bb[color * 6 + KING].bit_length() - 1
+
+    def in_check(self, color=None):
+        color = self.turn if color is None else color
+        return self.is_attacked(self.king_square(color), color ^ 1)
+
+    # move generation
+
+    def pseudo_moves(self, color=None):
+        us = self.turn if color is None else color
+        bb = self.bb
+        own = self.occ[us]
+        enemy = self.occ[us ^ 1]
+        occ = own | enemy
+        empty = ~occ & FULL
+        base = us * 6
+        moves = []
+
+        # pawns
+        pawns = bb[base + PAWN]
+        if us == WHITE:
+            step = 8
+            push1 = (pawns << 8) & empty
+            push2 = ((push1 & RANK_3) << 8) & empty
+            last = RANK_8
+        else:
+            step = -8
+            push1 = (pawns >> 8) & empty
+            push2 = ((push1 & RANK_6) >> 8) & empty
+            last = RANK_1
+        for to in bits(push1):
+            self._add_pawn_move(moves, to - step, to, last)
+        for to in bits(push2):
+            moves.append(to - 2 * step | to << 6)
+        ep = 1 << self.ep if self.ep >= 0 and us == self.turn else 0
+        for frm in bits(pawns):
+            for to in bits(PAWN_BB[us][frm] & (enemy | ep)):
+                self._add_pawn_move(moves, frm, to, last)
+
+        # pieces
+        for frm in bits(bb[base + KNIGHT]):
+            for to in bits(KNIGHT_BB[frm] & ~own):
+                moves.append(frm | to << 6)
+        for frm in bits(bb[base + BISHOP]):
+            for to in bits(bishop_attacks(frm, occ) & ~own):
+                moves.append(frm | to << 6)
+        for frm in bits(bb[base + ROOK]):
+            for to in bits(rook_attacks(frm, occ) & ~own):
+                moves.append(frm | to << 6)
+        for frm in bits(bb[base + QUEEN]):
+            for to in bits((rook_attacks(frm, occ) | bishop_attacks(frm, occ)) & ~own):
+                moves.append(frm | to << 6)
+
+        # king and castling
+        king = self.king_square(us)
+        if king >= 0:
+            for to in bits(KING_BB[king] & ~own):
+                moves.append(king | to << 6)
+            kside, qside = (CASTLE_WK, CASTLE_WQ) if us == WHITE else (CASTLE_BK, CASTLE_BQ)
+            if self.castling & kside and not occ & (0x60 << (56 * us)):
+                moves.append(king | king + 2 << 6)
+            if self.castling & qside and not occ & (0x0E << (56 * us)):
+                moves.append(king | king - 2 << 6)
+
+        return moves
+
+    def _add_pawn_move(self, moves, frm, to, last):
+        if 1 << to & last:
+            for promotion in (QUEEN, ROOK, BISHOP, KNIGHT):
+                moves.append(frm | to << 6 | promotion << 12)
+        else:
+            moves.append(frm | to << 6)
+
+    def legal_moves(self, color=None):
+        us = self.turn if color is None else color
+        cache_key = (self.key, us)
+        moves = self.move_cache.get(cache_key)
+        if moves is not None:
+            self.move_cache.move_to_end(cache_key)
+            return moves
+
+        moves = tuple(self._legal_moves(us))
+        self.move_cache[cache_key] = moves
+        if len(self.move_cache) > MOVE_CACHE_SIZE:
+            self.move_cache.popitem(last=False)
+        return moves
+
+    def _legal_moves(self, us):
+        them = us ^ 1
+        king = self.king_square(us)
+        occ = self.occ[0] | self.occ[1]
+        checkers = self.attackers(king, them, occ)
+        pinned = self._pinned(us, king, occ)
+        if checkers:
+            double = checkers & (checkers - 1)
+            checker = checkers.bit_length() - 1
+            evasions = checkers | BETWEEN[king][checker]
+
+        moves = []
+        for move in self.pseudo_moves(us):
+            frm = move & 63
+            to = move >> 6 & 63
+            if frm == king:
+                if to - frm == 2 or frm - to == 2:
+                    # castling: not out of, through or into check
+                    if checkers or self.is_attacked((frm + to) // 2, them, occ) or self.is_attacked(to, them, occ):
+                        continue
+                elif self.is_attacked(to, them, occ ^ (1 << frm)):
+                    continue
+            elif to == self.ep and us == self.turn and self.mailbox[frm] % 6 == PAWN:
+                # en passant can uncover the king along a rank, so test it on the board
+                self.push(move)
+                exposed = self.is_attacked(king, them)
+                self.pop()
+                if exposed:
+                    continue
+            else:
+                if checkers and (double or not evasions & (1 << to)):
+                    continue
+                if pinned & (1 << frm) and not LINE[king][frm] & (1 << to):
+                    continue
+            moves.append(move)
+        return moves
+
+    def _pinned(self, us, king, occ):
+        bb = self.bb
+        base = (us ^ 1) * 6
+        snipers = ((ROOK_BB[king] & (bb[base + ROOK] | bb[base + QUEEN]))
+                   | (BISHOP_BB[king] & (bb[base + BISHOP] | bb[base + QUEEN])))
+        pinned = 0
+        for sniper in bits(snipers):
+            between = BETWEEN[king][sniper] & occ
+            if between and not between & (between - 1) and between & self.occ[us]:
+                pinned |= between
+        return pinned
+
+    # make / unmake
+
+    def push(self, move):
+        frm = move & 63
+        to = move >> 6 & 63
+        promotion = move >> 12
+        piece = self.mailbox[frm]
+        kind = piece % 6
+        us = piece // 6
+
+        capsq = to
+        if kind == PAWN and to == self.ep:
+            capsq = to - 8 if us == WHITE else to + 8
+        captured = self.mailbox[capsq]
+        # the side to move is saved too, a move may be made for the side not on move
+        self.history.append((move, captured, capsq, self.castling, self.ep, self.halfmove, self.key,
+                             self.turn, self.fullmove))
+        self.key ^= ZOBRIST_CASTLING[self.castling] ^ self._ep_key()
+
+        if captured >= 0:
+            self._remove(captured, capsq)
+        self._remove(piece, frm)
+        self._put(us * 6 + promotion if promotion else piece, to)
+
+        if kind == KING and (to - frm == 2 or frm - to == 2):
+            rook_frm, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            self._remove(us * 6 + ROOK, rook_frm)
+            self._put(us * 6 + ROOK, rook_to)
+
+        self.castling &= CASTLE_KEEP[frm] & CASTLE_KEEP[to]
+        self.ep = (frm + to) // 2 if kind == PAWN and (to - frm == 16 or frm - to == 16) else -1
+        self.halfmove = 0 if kind == PAWN or captured >= 0 else self.halfmove + 1
+        if us == BLACK:
+            self.fullmove += 1
+        if self.turn == us:
+            self.key ^= ZOBRIST_TURN
+        self.turn = us ^ 1
+        self.key ^= ZOBRIST_CASTLING[self.castling] ^ self._ep_key()
+
+    def pop(self):
+        move, captured, capsq, castling, ep, halfmove, key, turn, fullmove = self.history.pop()
+        frm = move & 63
+        to = move >> 6 & 63
+        piece = self.mailbox[to]
+        us = piece // 6
+        self.turn = turn
+        self.fullmove = fullmove
+
+        self._remove(piece, to)
+        if move >> 12:
+            piece = us * 6 + PAWN
+        self._put(piece, frm)
+
+        if piece % 6 == KING and (to - frm == 2 or frm - to == 2):
+            rook_frm, rook_to = (frm + 3, frm + 1) if to > frm else (frm - 4, frm - 1)
+            self._remove(us * 6 + ROOK, rook_to)
+            self._put(us * 6 + ROOK, rook_frm)
+
+        if captured >= 0:
+            self._put(captured, capsq)
+        self.castling = castling
+        self.ep = ep
+        self.halfmove = halfmove
+        self.key = key
+        return move
+
+    def _put(self, piece, sq):
+        b = 1 << sq
+        self.bb[piece] |= b
+        self.occ[piece // 6] |= b
+        self.mailbox[sq] = piece
+        self.ranks[7 - (sq >> 3)] = None
+        self.key ^= ZOBRIST_PIECES[piece][sq]
+
+    def _remove(self, piece, sq):
+        b = ~(1 << sq)
+        self.bb[piece] &= b
+        self.occ[piece // 6] &= b
+        self.mailbox[sq] = -1
+        self.ranks[7 - (sq >> 3)] = None
+        self.key ^= ZOBRIST_PIECES[piece][sq]
@@ -0,0 +1,233 @@
+from .const import *
+from .square import Square
+from .piece import *
+from .move import Move
+from .bitboard import *
+
+PIECE_CLASSES = [Pawn, Knight, Bishop, Rook, Queen, King]
+COLOR_IDS = {'white': WHITE, 'black': BLACK}
+
+class Board:
+
+    def __init__(self, fen=START_FEN):
+        self.squares = [[0, 0, 0, 0, 0, 0, 0, 0] for col in range(COLS)]
+        self.last_move = None
+        # (row, col) a pawn just skipped over, None when there is no en passant
+        self.ep_square = None
+        # squares of each side's pieces and of each king, kept up to date by make_move
+        self.pieces = {'white': set(), 'black': set()}
+        self.kings = {}
+        self.core = BitBoard(fen)
+        self.legal_index = {}
+        self.listeners = []
+        self._create()
+        self._add_pieces()
+        self.index_legal_moves()
+
+    def move(self, piece, move, testing=False):
+        undo = self.make_move(piece, move)
+
+        piece.clear_moves()
+        if not testing:
+            self.index_legal_moves()
+            for listener in self.listeners:
+                listener(piece, move, undo[3])
+
+    def add_listener(self, listener):
+        # called as listener(piece, move, captured) after every played move
+        self.listeners.append(listener)
+
+    def index_legal_moves(self):
+        # legal moves of the side to move, keyed by origin then destination square
+        self.legal_index = {}
+        for m in self.core.legal_moves():
+            # the board view always promotes to a queen
+            if m >> 12 not in (0, QUEEN):
+                continue
+            move = Move.from_code(m & 4095)
+            initial, final = move.initial, move.final
+            self.legal_index.setdefault((initial.row, initial.col), {})[(final.row, final.col)] = move
+
+    def moves_at(self, row, col):
+        return list(self.legal_index.get((row, col), {}).values())
+
+    def make_move(self, piece, move):
+        initial = move.initial
+        final = move.final
+        initial_sqr = self.squares[initial.row][initial.col]
+        final_sqr = self.squares[final.row][final.col]
+
+        # capture (en passant takes the pawn beside the initial square)
+        captured_sqr = final_sqr
+        if isinstance(piece, Pawn) and (final.row, final.col) == self.ep_square:
+            captured_sqr = self.squares[initial.row][final.col]
+        captured = captured_sqr.piece
+        captured_sqr.piece = None
+
+        initial_sqr.piece = None
+        final_sqr.piece = piece
+
+        own = self.pieces[piece.color]
+        own.discard((initial.row, initial.col))
+        own.add((final.row, final.col))
+        if captured:
+            self.pieces[captured.color].discard((captured_sqr.row, captured_sqr.col))
+        if isinstance(piece, King):
+            self.kings[piece.color] = (final.row, final.col)
+
+        # promotion
+        promoted = None
+        if isinstance(piece, Pawn) and (final.row == 0 or final.row == 7):
+            promoted = PIECE_CLASSES[PIECE_NAMES.index(move.promotion or 'queen')](piece.color)
+            promoted.moved = True
+            final_sqr.piece = promoted
+
+        # castling
+        rook = None
+        rook_moved = False
+        if isinstance(piece, King) and self.castling(initial, final):
+            rook_col, rook_end_col = (0, 3) if final.col < initial.col else (7, 5)
+            rook = self.squares[initial.row][rook_col].piece
+            rook_moved = rook.moved
+            self.squares[initial.row][rook_col].piece = None
+            self.squares[initial.row][rook_end_col].piece = rook
+            rook.moved = True
+            own.discard((initial.row, rook_col))
+            own.add((initial.row, rook_end_col))
+
+        # en passant target
+        ep_square = self.ep_square
+        self.ep_square = None
+        if isinstance(piece, Pawn) and abs(final.row - initial.row) == 2:
+            self.ep_square = ((initial.row + final.row) // 2, initial.col)
+
+        undo = (piece, move, piece.moved, captured, captured_sqr, promoted, rook, rook_moved, ep_square, self.last_move)
+        piece.moved = True
+        self.last_move = move
+        self.core.push(self._encode(piece, move))
+        return undo
+
+    def unmake_move(self, undo):
+        piece, move, moved, captured, captured_sqr, promoted, rook, rook_moved, ep_square, last_move = undo
+        initial = move.initial
+        final = move.final
+        own = self.pieces[piece.color]
+
+        if rook:
+            rook_col, rook_end_col = (0, 3) if final.col < initial.col else (7, 5)
+            self.squares[initial.row][rook_end_col].piece = None
+            self.squares[initial.row][rook_col].piece = rook
+            rook.moved = rook_moved
+            own.discard((initial.row, rook_end_col))
+            own.add((initial.row, rook_col))
+
+        self.squares[final.row][final.col].piece = None
+        self.squares[initial.row][initial.col].piece = piece
+        captured_sqr.piece = captured
+
+        own.discard((final.row, final.col))
+        own.add((initial.row, initial.col))
+        if captured:
+            self.pieces[captured.color].add((captured_sqr.row, captured_sqr.col))
+        if isinstance(piece, King):
+            self.kings[piece.color] = (initial.row, initial.col)
+
+        self.ep_square = ep_square
+
+        piece.moved = moved
+        self.last_move = last_move
+        self.core.pop()
+
+    def _encode(self, piece, move):
+        # a pawn reaching the last row without a chosen piece becomes a queen
+        if not move.code >> 12 and isinstance(piece, Pawn) and (move.final.row == 0 or move.final.row == 7):
+            return move.code | QUEEN << 12
+        return move.code
+
+    def fen(self):
+        return self.core.fen()
+
+    def last_uci(self):
+        # the last played move as the core encoded it, promotion letter included
+        return uci(self.core.history[-1][0]) if self.core.history else None
+
+    def is_threefold_repetition(self):
+        return self.core.is_repetition(3)
+
+    def valid_move(self, piece, move):
+        initial, final = move.initial, move.final
+        if self.squares[initial.row][initial.col].piece is not piece:
+            return False
+        return (final.row, final.col) in self.legal_index.get((initial.row, initial.col), {})
+
+    def castling(self, initial, final):
+        return abs(initial.col - final.col) == 2
+
+    def in_check(self, piece, move):
+        undo = self.make_move(piece, move)
+        check = self.core.in_check(COLOR_IDS[piece.color])
+        self.unmake_move(undo)
+        return check
+
+    def king_square(self, color):
+        return self.kings.get(color)
+
+    def is_square_attacked(self, sqr, by_color):
+        return self.core.is_attacked(square(sqr.row, sqr.col), COLOR_IDS[by_color])
+
+    def legal_moves(self, color=None):
+        color = self.core.turn if color is None else COLOR_IDS[color]
+        return [Move.from_code(m) for m in self.core.legal_moves(color)]
+
+    def calc_moves(self, piece, row, col, bool=True):
+        color = COLOR_IDS[piece.color]
+        frm = square(row, col)
+        moves = self.core.legal_moves(color) if bool else self.core.pseudo_moves(color)
+
+        for m in moves:
+            # the board view always promotes to a queen
+            if m & 63 != frm or m >> 12 not in (0, QUEEN):
+                continue
+            move = Move.from_code(m & 4095)
+            piece.add_move(move)
+
+            if isinstance(piece, King) and self.castling(move.initial, move.final):
+                rook_col, rook_end_col = (0, 3) if move.final.col < col else (7, 5)
+                rook = self.squares[row][rook_col].piece
+                rook.add_move(Move(Square.at(row, rook_col), Square.at(row, rook_end_col)))
+                if move.final.col < col:
+                    piece.left_rook = rook
+                else:
+                    piece.right_rook = rook
+
+    def _create(self):
+        for row in range(ROWS):
+            for col in range(COLS):
+                self.squares[row][col] = Square(row, col)
+
+    def _add_pieces(self):
+        core = self.core
+        for sq, p in enumerate(core.mailbox):
+            if p < 0: continue
+            row, col = row_col(sq)
+            piece = PIECE_CLASSES[p % 6](COLORS[p // 6])
+            piece.moved = self._moved(piece, sq)
+            self.squares[row][col].piece = piece
+            self.pieces[piece.color].add((row, col))
+            if isinstance(piece, King):
+                self.kings[piece.color] = (row, col)
+
+        if core.ep >= 0:
+            self.ep_square = row_col(core.ep)
+
+    def _moved(self, piece, sq):
+        rights = self.core.castling
+        if isinstance(piece, Pawn):
+            return sq >> 3 != (1 if piece.color == 'white' else 6)
+        if isinstance(piece, King):
+            own = CASTLE_WK | CASTLE_WQ if piece.color == 'white' else CASTLE_BK | CASTLE_BQ
+            return not rights & own
+        if isinstance(piece, Rook):
+            corners = {0: CASTLE_WQ, 7: CASTLE_WK, 56: CASTLE_BQ, 63: CASTLE_BK}
+            return not rights & corners.get(sq, 0)
+        return False
@@ -0,0 +1,3 @@
+# Board dimensions
+ROWS = 8
+COLS = 8
@@ -0,0 +1,47 @@
+from .square import SQUARES
+
+class Move:
+
+    __slots__ = ('initial', 'final', 'code')
+
+    PROMOTION_LETTERS = {'queen': 'q', 'rook': 'r', 'bishop': 'b', 'knight': 'n'}
+    # promotion pieces numbered like the bitboard core
+    PROMOTIONS = [None, 'knight', 'bishop', 'rook', 'queen']
+
+    def __init__(self, initial, final, promotion=None):
+        # initial and final are squares, promotion is a piece name or None (queen)
+        self.initial = SQUARES[initial.row * 8 + initial.col]
+        self.final = SQUARES[final.row * 8 + final.col]
+        # the core's move int: from | to << 6 | promotion << 12, squares counted from a1
+        self.code = ((self.initial.row * 8 + self.initial.col) ^ 56 | ((self.final.row * 8 + self.final.col) ^ 56) << 6
+                     | (self.PROMOTIONS.index(promotion) if promotion else 0) << 12)
+
+    @classmethod
+    def from_code(cls, code):
+        move = object.__new__(cls)
+        move.initial = SQUARES[code & 63 ^ 56]
+        move.final = SQUARES[code >> 6 & 63 ^ 56]
+        move.code = code
+        return move
+
+    @property
+    def promotion(self):
+        return self.PROMOTIONS[self.code >> 12]
+
+    def __str__(self):
+        s = ''
+        s += f'({self.initial.col}, {self.initial.row})'
+        s += f' -> ({self.final.col}, {self.final.row})'
+        return s
+
+    def __eq__(self, other):
+        return self.code == other.code
+
+    def __hash__(self):
+        return self.code
+
+    def uci(self):
+        s = f'{self.initial.alphacol}{8 - self.initial.row}{self.final.alphacol}{8 - self.final.row}'
+        if self.promotion:
+            s += self.PROMOTION_LETTERS[self.promotion]
+        return s
@@ -0,0 +1,64 @@
+class Square:
+
+    __slots__ = ('row', 'col', 'piece')
+
+    ALPHACOLS = 'abcdefgh'
+
+    def __init__(self, row, col, piece=None):
+        self.row = row
+        self.col = col
+        self.piece = piece
+
+    @property
+    def alphacol(self):
+        return self.ALPHACOLS[self.col]
+
+    def __eq__(self, other):
+        return self.row == other.row and self.col == other.col
+
+    def __hash__(self):
+        return self.row * 8 + self.col
+
+    def has_piece(self):
+        return self.piece != None
+
+    def isempty(self):
+        return not self.has_piece()
+
+    def has_team_piece(self, color):
+        return self.has_piece() and self.piece.color == color
+
+    def has_enemy_piece(self, color):
+        return self.has_piece() and self.piece.color != color
+
+    def isempty_or_enemy(self, color):
+        return self.isempty() or self.has_enemy_piece(color)
+
+    @staticmethod
+    def at(row, col):
+        # the shared coordinate square, for moves and lookups, never a board cell
+        return SQUARES[row * 8 + col]
+
+    @staticmethod
+    def in_range(row, col):
+        return 0 <= row <= 7 and 0 <= col <= 7
+
+    @staticmethod
+    def get_alphacol(col):
+        return Square.ALPHACOLS[col]
+
+class FixedSquare(Square):
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError('interned squares are immutable')
+
+def _fixed(row, col):
+    sq = object.__new__(FixedSquare)
+    object.__setattr__(sq, 'row', row)
+    object.__setattr__(sq, 'col', col)
+    object.__setattr__(sq, 'piece', None)
+    return sq
+
+SQUARES = tuple(_fixed(row, col) for row in range(8) for col in range(8))
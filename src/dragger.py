@@ -1,6 +1,5 @@
-import pygame
-
 from const import *
+from assets import Assets
 
 class Dragger:
 
@@ -15,16 +14,13 @@ class Dragger:
     # blit method
 
     def update_blit(self, surface):
-        # texture
-        self.piece.set_texture(size=128)
-        texture = self.piece.texture
         # img
-        img = pygame.image.load(texture)
+        img = Assets.image(self.piece.color, self.piece.name, 128)
         # rect
         img_center = (self.mouseX, self.mouseY)
-        self.piece.texture_rect = img.get_rect(center=img_center)
+        texture_rect = img.get_rect(center=img_center)
         # blit
-        surface.blit(img, self.piece.texture_rect)
+        surface.blit(img, texture_rect)
 
     # other methods
 
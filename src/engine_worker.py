@@ -0,0 +1,92 @@
+import queue
+import threading
+
+import chess.engine
+import pygame
+
+from analysis import Analyzer, NativeAnalyzer
+from analysis_cache import AnalysisCache, ANALYSIS_CACHE_PATH
+from book import OpeningBook, BOOK_PATH
+from tablebase import Tablebase, TABLEBASE_PATH
+
+# posted to the pygame event queue with kind, generation and result attributes
+ENGINE_EVENT = pygame.USEREVENT + 1
+
+class EngineWorker(threading.Thread):
+
+    def __init__(self, path, native=False, cache_path=ANALYSIS_CACHE_PATH, book_path=BOOK_PATH,
+                 tablebase_path=TABLEBASE_PATH):
+        super().__init__(daemon=True)
+        self.engine = None
+        if not native:
+            try:
+                self.engine = chess.engine.SimpleEngine.popen_uci(path)
+            except (OSError, chess.engine.EngineError) as e:
+                print("[XATOLIK] Stockfish ishga tushmadi, ichki dvigatel ishlatiladi:", e)
+        cache = AnalysisCache(cache_path)
+        self.book = OpeningBook.open(book_path)
+        self.tablebase = Tablebase.open(tablebase_path)
+        if self.engine:
+            self.analyzer = Analyzer(self.engine, cache, book=self.book, tablebase=self.tablebase)
+        else:
+            self.analyzer = NativeAnalyzer(cache, book=self.book, tablebase=self.tablebase)
+        self.requests = queue.Queue()
+        # bumped on reset, requests and results from older generations are dropped
+        self.generation = 0
+
+    # requests
+
+    def review(self, fen_before, uci, start_time):
+        self.requests.put((self.generation, 'review', (fen_before, uci, start_time)))
+
+    def ai_move(self, fen):
+        self.requests.put((self.generation, 'ai', (fen,)))
+
+    def cancel(self):
+        self.generation += 1
+        try:
+            while True:
+                self.requests.get_nowait()
+        except queue.Empty:
+            pass
+
+    def stop(self):
+        self.cancel()
+        self.requests.put(None)
+
+    # worker thread
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            generation, kind, args = request
+            if generation != self.generation:
+                continue
+
+            try:
+                if kind == 'review':
+                    result = self.analyzer.review_move(*args)
+                else:
+                    result = self.analyzer.ai_move(*args)
+            except Exception as e:
+                result = {"error": e}
+
+            pygame.event.post(pygame.event.Event(ENGINE_EVENT, kind=kind, generation=generation, result=result))
+
+            # search the position the player now faces while they think,
+            # it is the before-position of their next review
+            if kind == 'ai' and 'error' not in result and self.requests.empty():
+                try:
+                    self.analyzer.prefetch(result['fen_after'])
+                except Exception as e:
+                    print("[XATOLIK] Eng yaxshi yurishni aniqlashda xato:", e)
+
+        if self.engine:
+            self.engine.quit()
+        self.analyzer.cache.close()
+        if self.book:
+            self.book.close()
+        if self.tablebase:
+            self.tablebase.close()
@@ -1,10 +1,11 @@
+import chess
 import pygame
 
 from const import *
-from board import Board
+from core import Board, Square
 from dragger import Dragger
 from config import Config
-from square import Square
+from assets import Assets
 
 class Game:
 
@@ -12,8 +13,11 @@ class Game:
         self.next_player = 'white'
         self.hovered_sqr = None
         self.board = Board()
+        # python-chess copy of the game for the engine, kept in step by on_move
+        self.position = chess.Board()
         self.dragger = Dragger()
         self.config = Config()
+        self.board.add_listener(self.on_move)
 
     # blit methods
 
@@ -50,19 +54,16 @@ class Game:
                     surface.blit(lbl, lbl_pos)
 
     def show_pieces(self, surface):
-        for row in range(ROWS):
-            for col in range(COLS):
-                # piece ?
-                if self.board.squares[row][col].has_piece():
-                    piece = self.board.squares[row][col].piece
-                    
-                    # all pieces except dragger piece
-                    if piece is not self.dragger.piece:
-                        piece.set_texture(size=80)
-                        img = pygame.image.load(piece.texture)
-                        img_center = col * SQSIZE + SQSIZE // 2, row * SQSIZE + SQSIZE // 2
-                        piece.texture_rect = img.get_rect(center=img_center)
-                        surface.blit(img, piece.texture_rect)
+        for squares in self.board.pieces.values():
+            for row, col in squares:
+                piece = self.board.squares[row][col].piece
+
+                # all pieces except dragger piece
+                if piece is not self.dragger.piece:
+                    img = Assets.image(piece.color, piece.name, 80)
+                    img_center = col * SQSIZE + SQSIZE // 2, row * SQSIZE + SQSIZE // 2
+                    texture_rect = img.get_rect(center=img_center)
+                    surface.blit(img, texture_rect)
 
     def show_moves(self, surface):
         theme = self.config.theme
@@ -114,6 +115,10 @@ class Game:
     def change_theme(self):
         self.config.change_theme()
 
+    def on_move(self, piece, move, captured):
+        self.position.push(chess.Move.from_uci(self.board.last_uci()))
+        self.play_sound(captured is not None)
+
     def play_sound(self, captured=False):
         if captured:
             self.config.capture_sound.play()
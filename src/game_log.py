@@ -0,0 +1,67 @@
+import json
+import time
+from array import array
+
+from archive import ArchiveWriter, encode_uci, encode_eval, NO_EVAL
+
+LOG_PATH = 'evaluation.jsonl'
+PGN_PATH = 'games.pgn'
+ARCHIVE_PATH = 'games'
+
+class GameLog:
+
+    # every result goes to disk as it arrives, the game itself is archived when it ends
+    def __init__(self, log_path=LOG_PATH, pgn_path=PGN_PATH, archive_path=ARCHIVE_PATH,
+                 white='Player', black='Stockfish'):
+        self.log = open(log_path, 'a', encoding='utf-8')
+        self.pgn = open(pgn_path, 'a', encoding='utf-8')
+        self.archive = ArchiveWriter(archive_path)
+        self.players = (white, black)
+        self.game = None
+        self.new_game()
+
+    def new_game(self):
+        self.game = self.archive.games
+        self.date = time.strftime('%Y.%m.%d')
+        # evals by ply, 2 bytes each, NO_EVAL where no result came back
+        self.evals = array('h')
+
+    def record(self, ply, uci, item):
+        # ply number, uci and the review or AI result, one JSON line
+        while len(self.evals) < ply:
+            self.evals.append(NO_EVAL)
+        self.evals[ply - 1] = encode_eval(item.get('eval'))
+        entry = {"game": self.game, "ply": ply, "uci": uci, **item}
+        self.log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.log.flush()
+
+    def end_game(self, position):
+        # writes the finished game to the PGN and the archive, nothing for an empty board
+        if position.move_stack:
+            self.pgn.write(self.pgn_text(position) + '\n\n')
+            self.pgn.flush()
+            # the moves come from the game, results that never arrived leave NO_EVAL behind
+            codes = array('H', (encode_uci(move.uci()) for move in position.move_stack))
+            evals = self.evals[:len(codes)]
+            evals.extend([NO_EVAL] * (len(codes) - len(evals)))
+            self.archive.add_packed(codes, evals)
+        self.new_game()
+
+    def pgn_text(self, position):
+        import chess.pgn
+
+        pgn = chess.pgn.Game.from_board(position)
+        pgn.headers.update(Event='Chess AI', Site='Local', Date=self.date, Round=str(self.game + 1),
+                           White=self.players[0], Black=self.players[1])
+        return str(pgn)
+
+    def save(self, position, path='game.pgn'):
+        # a snapshot of the game in progress, the logs themselves are already on disk
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.pgn_text(position) + '\n')
+
+    def close(self, position):
+        self.end_game(position)
+        self.log.close()
+        self.pgn.close()
+        self.archive.close()
@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from core import Board, START_FEN
+
+# name: (fen, known node counts for depth 1, 2, 3, ...)
+POSITIONS = {
+    'startpos': (START_FEN, [20, 400, 8902, 197281, 4865609]),
+    'kiwipete': ('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1', [48, 2039, 97862, 4085603]),
+    'position3': ('8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2812, 43238, 674624]),
+    'position4': ('r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1', [6, 264, 9467, 422333]),
+    'position5': ('rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8', [44, 1486, 62379, 2103487]),
+    # en passant edge cases
+    'ep_pinned': ('3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1', [18, 92, 1670, 10138]),
+    'ep_gives_check': ('8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1', [15, 126, 1928, 13931]),
+    # promotion edge cases
+    'underpromotion': ('8/P1k5/K7/8/8/8/8/8 w - - 0 1', [6, 27, 273, 1329]),
+    'promotion_check': ('4k3/1P6/8/8/8/8/K7/8 w - - 0 1', [9, 40, 472, 2661]),
+}
+
+def perft(board, depth):
+    if depth == 0:
+        return 1
+    moves = board.legal_moves()
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        undo = board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+def _divide_root(task):
+    fen, uci, depth = task
+    board = Board(fen)
+    move = next(m for m in board.legal_moves() if m.uci() == uci)
+    board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+    return uci, perft(board, depth - 1)
+
+def divide(fen, depth, workers=1):
+    board = Board(fen)
+    tasks = [(fen, move.uci(), depth) for move in board.legal_moves()]
+    if workers > 1:
+        with Pool(workers) as pool:
+            return dict(pool.imap_unordered(_divide_root, tasks))
+    return dict(_divide_root(task) for task in tasks)
+
+def run(names, depth, workers=1, show_divide=False):
+    ok = True
+    for name in names:
+        fen, expected = POSITIONS[name]
+        d = min(depth, len(expected))
+        start = time.perf_counter()
+        counts = divide(fen, d, workers)
+        elapsed = time.perf_counter() - start
+        nodes = sum(counts.values())
+        status = 'ok' if nodes == expected[d - 1] else f'FAIL (expected {expected[d - 1]})'
+        ok = ok and nodes == expected[d - 1]
+        print(f'[PERFT] {name} depth {d}: {nodes} nodes {status} | {elapsed:.2f}s | {nodes / max(elapsed, 1e-9):,.0f} nps')
+        if show_divide:
+            for uci in sorted(counts):
+                print(f'  {uci}: {counts[uci]}')
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description='Perft / divide over Board.legal_moves')
+    parser.add_argument('positions', nargs='*', default=list(POSITIONS), help='position names (default: all)')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--divide', action='store_true', help='print node counts per root move')
+    args = parser.parse_args()
+    sys.exit(0 if run(args.positions, args.depth, args.workers, args.divide) else 1)
+
+if __name__ == '__main__':
+    main()
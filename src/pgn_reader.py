@@ -0,0 +1,195 @@
+import argparse
+import re
+import time
+
+from core import Board, Move
+from core.bitboard import (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE,
+                           KNIGHT_BB, KING_BB, rook_attacks, bishop_attacks, bits)
+
+HEADER = re.compile(r'\[(\w+)\s+"(.*)"\]')
+TOKEN = re.compile(r'\{[^}]*\}|\(|\)|\$\d+|[^\s(){}]+')
+MOVE_NUMBER = re.compile(r'^\d+\.+')
+RESULTS = {'1-0', '0-1', '1/2-1/2', '*'}
+
+SAN_PIECES = {'N': KNIGHT, 'B': BISHOP, 'R': ROOK, 'Q': QUEEN, 'K': KING}
+
+class ReplayError(ValueError):
+    pass
+
+# reading
+
+def read_games(f):
+    # yields (headers, [san, ...]) one game at a time, the file is never read whole
+    headers = {}
+    movetext = []
+    for line in f:
+        line = line.strip()
+        if line.startswith('[') and not line.startswith('[%'):
+            if movetext:
+                yield headers, _sans(' '.join(movetext))
+                headers, movetext = {}, []
+            match = HEADER.match(line)
+            if match:
+                headers[match.group(1)] = match.group(2)
+        elif line and not line.startswith('%'):
+            if ';' in line and '{' not in line:
+                line = line[:line.index(';')]
+            movetext.append(line)
+    if headers or movetext:
+        yield headers, _sans(' '.join(movetext))
+
+def _sans(text):
+    sans = []
+    depth = 0
+    for token in TOKEN.findall(text):
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth or token[0] in '{$' or token in RESULTS:
+            continue
+        else:
+            token = MOVE_NUMBER.sub('', token)
+            if token:
+                sans.append(token)
+    return sans
+
+# san -> Move on our own board
+
+def parse_san(board, san, trusted=False):
+    core = board.core
+    us = core.turn
+    text = san.rstrip('+#!?')
+
+    if text in ('O-O', '0-0', 'O-O-O', '0-0-0'):
+        king = core.king_square(us)
+        candidates = [king | (king + 2 if len(text) == 3 else king - 2) << 6]
+    else:
+        promotion = 0
+        if '=' in text:
+            text, piece = text.split('=')
+            promotion = SAN_PIECES[piece[0]]
+        elif text[-1] in 'NBRQ' and text[0].islower():
+            text, promotion = text[:-1], SAN_PIECES[text[-1]]
+        kind = SAN_PIECES.get(text[0], PAWN)
+        body = (text if kind == PAWN else text[1:]).replace('x', '').replace('-', '')
+        if len(body) < 2 or body[-2] not in 'abcdefgh' or body[-1] not in '12345678':
+            raise ReplayError(f"Bad SAN {san}")
+        to = 'abcdefgh'.index(body[-2]) + 8 * (int(body[-1]) - 1)
+        hint = body[:-2]
+        candidates = [frm | to << 6 | promotion << 12 for frm in _origins(core, us, kind, to, hint)
+                      if _matches(frm, hint)]
+
+    if not trusted or len(candidates) != 1:
+        # a pinned piece is left out of SAN disambiguation, only legal moves settle it
+        legal = core.legal_moves()
+        candidates = [m for m in candidates if m in legal]
+    if len(candidates) != 1:
+        raise ReplayError(f"{'Ambiguous' if candidates else 'Illegal'} move {san} in {board.fen()}")
+    return Move.from_code(candidates[0])
+
+def _origins(core, us, kind, to, hint):
+    # squares our pieces of `kind` could come from to reach `to`, before legality
+    occ = core.occ[0] | core.occ[1]
+    pieces = core.bb[us * 6 + kind]
+    if kind == KNIGHT:
+        return bits(KNIGHT_BB[to] & pieces)
+    if kind == BISHOP:
+        return bits(bishop_attacks(to, occ) & pieces)
+    if kind == ROOK:
+        return bits(rook_attacks(to, occ) & pieces)
+    if kind == QUEEN:
+        return bits((rook_attacks(to, occ) | bishop_attacks(to, occ)) & pieces)
+    if kind == KING:
+        return bits(KING_BB[to] & pieces)
+
+    step = -8 if us == WHITE else 8
+    if hint and hint[0] in 'abcdefgh':
+        frm = to + step + 'abcdefgh'.index(hint[0]) - (to & 7)
+        return [frm] if 0 <= frm < 64 and pieces >> frm & 1 else []
+    if 0 <= to + step < 64 and pieces >> (to + step) & 1:
+        return [to + step]
+    frm = to + 2 * step
+    return [frm] if 0 <= frm < 64 and pieces >> frm & 1 and not occ >> (to + step) & 1 else []
+
+def _matches(frm, hint):
+    for ch in hint:
+        if ch in 'abcdefgh' and frm & 7 != 'abcdefgh'.index(ch):
+            return False
+        if ch in '12345678' and frm >> 3 != int(ch) - 1:
+            return False
+    return True
+
+# replay
+
+def replay(headers, sans, trusted=False):
+    board = Board(headers['FEN']) if 'FEN' in headers else Board()
+    for san in sans:
+        move = parse_san(board, san, trusted)
+        board.move(board.squares[move.initial.row][move.initial.col].piece, move, testing=True)
+        yield board, move
+
+def compare(headers, sans):
+    # replays a game on our board and on python-chess, returns the first divergence or None
+    import chess
+
+    position = chess.Board(headers['FEN']) if 'FEN' in headers else chess.Board()
+    moves = replay(headers, sans)
+    for ply, san in enumerate(sans):
+        try:
+            theirs = position.parse_san(san)
+        except ValueError:
+            theirs = None
+        try:
+            board, move = next(moves)
+            ours = f"{move.uci()} {board.fen()}"
+        except ReplayError as e:
+            move, ours = None, str(e)
+
+        if theirs is None and move is None:
+            # both sides reject the move, the game itself is broken
+            raise ReplayError(ours)
+        if theirs is not None:
+            position.push(theirs)
+        if move is None or theirs is None or ours != f"{theirs.uci()} {position.fen(en_passant='fen')}":
+            return ply, san, ours, f"{theirs.uci()} {position.fen()}" if theirs else 'illegal'
+    return None
+
+def run(path, trusted=False, check=False, limit=None):
+    games = plies = 0
+    divergences = []
+    start = time.perf_counter()
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for index, (headers, sans) in enumerate(read_games(f)):
+            if limit is not None and index >= limit:
+                break
+            try:
+                if check:
+                    divergence = compare(headers, sans)
+                    if divergence:
+                        divergences.append((index, *divergence))
+                        print(f"[XATOLIK] o'yin {index + 1}, yurish {divergence[0] + 1} ({divergence[1]}): "
+                              f"bizda {divergence[2]} | python-chess {divergence[3]}")
+                else:
+                    for board, move in replay(headers, sans, trusted):
+                        pass
+            except ReplayError as e:
+                print(f"[XATOLIK] o'yin {index + 1}: {e}")
+            games += 1
+            plies += len(sans)
+    elapsed = time.perf_counter() - start
+    print(f"[INFO] {games} o'yin | {plies} yurish | {elapsed:.2f}s | {plies / max(elapsed, 1e-9):,.0f} yurish/s"
+          + (f" | {len(divergences)} farq" if check else ''))
+    return divergences
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay PGN games through Board')
+    parser.add_argument('pgn')
+    parser.add_argument('--trusted', action='store_true', help='skip legality checks for known-good games')
+    parser.add_argument('--check', action='store_true', help='compare every ply with python-chess')
+    parser.add_argument('--limit', type=int)
+    args = parser.parse_args()
+    run(args.pgn, args.trusted, args.check, args.limit)
+
+if __name__ == '__main__':
+    main()
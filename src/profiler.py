@@ -0,0 +1,147 @@
+import copy
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# CHESS_PROFILE=<json path> turns profiling on, CHESS_CPROFILE=<path> also dumps cProfile stats
+PROFILE_ENV = 'CHESS_PROFILE'
+CPROFILE_ENV = 'CHESS_CPROFILE'
+PROFILE_PATH = 'profile.json'
+SAMPLES = 10000
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+class Profiler:
+
+    def __init__(self, path=PROFILE_PATH, interval=10.0, cprofile_path=None):
+        self.path = path
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.start = time.time()
+        self.timings = {}
+        self.counters = {}
+        self.stopped = threading.Event()
+        self.profile = None
+        self.cprofile_path = cprofile_path
+        if cprofile_path:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        threading.Thread(target=self._export_loop, daemon=True).start()
+
+    @classmethod
+    def from_env(cls, argv=()):
+        # None unless asked for, so nothing is wrapped and nothing costs time
+        path = os.environ.get(PROFILE_ENV) or ('--profile' in argv and PROFILE_PATH)
+        cprofile_path = os.environ.get(CPROFILE_ENV) or ('--cprofile' in argv and 'profile.prof') or None
+        if not path and not cprofile_path:
+            return None
+        return cls(path or PROFILE_PATH, cprofile_path=cprofile_path)
+
+    # recording
+
+    def record(self, name, seconds):
+        with self.lock:
+            samples = self.timings.get(name)
+            if samples is None:
+                samples = self.timings[name] = [0, 0.0, deque(maxlen=SAMPLES)]
+            samples[0] += 1
+            samples[1] += seconds
+            samples[2].append(seconds)
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def wrap(self, owner, attr, name=None):
+        # replaces owner.attr (a class, instance or module) with a timed version
+        fn = getattr(owner, attr)
+        name = name or attr
+        record = self.record
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t)
+
+        setattr(owner, attr, timed)
+
+    def wrap_count(self, owner, attr, name=None):
+        fn = getattr(owner, attr)
+        name = name or attr
+        count = self.count
+        self.counters.setdefault(name, 0)
+
+        @wraps(fn)
+        def counted(*args, **kwargs):
+            count(name)
+            return fn(*args, **kwargs)
+
+        setattr(owner, attr, counted)
+
+    def instrument(self, main):
+        # the GUI pieces Main owns, patched in place
+        from core import Board
+
+        for method in ('show_bg', 'show_last_move', 'show_moves', 'show_pieces', 'show_hover'):
+            self.wrap(main.game, method, f'render.{method}')
+        self.wrap(main.renderer, 'update', 'render.frame')
+        for method in ('calc_moves', 'in_check', 'move', 'index_legal_moves'):
+            self.wrap(Board, method, f'board.{method}')
+        self.wrap_count(copy, 'deepcopy', 'copy.deepcopy')
+
+        worker = main.worker
+        if worker.engine:
+            self.wrap(worker.engine, 'analyse', 'engine.analyse')
+            self.wrap(worker.engine, 'play', 'engine.play')
+        self.wrap(worker.analyzer, 'analyse', 'analyzer.analyse')
+        self.wrap(worker.analyzer, 'review_move', 'analyzer.review_move')
+        self.wrap(worker.analyzer, 'ai_move', 'analyzer.ai_move')
+
+    # export
+
+    def summary(self):
+        with self.lock:
+            timings = {name: (n, total, list(samples)) for name, (n, total, samples) in self.timings.items()}
+            counters = dict(self.counters)
+
+        data = {"uptime": round(time.time() - self.start, 1), "timings": {}, "counters": counters}
+        for name, (n, total, samples) in sorted(timings.items()):
+            data["timings"][name] = {
+                "count": n,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total * 1000 / n, 3),
+                "p50_ms": round(percentile(samples, 50) * 1000, 3),
+                "p90_ms": round(percentile(samples, 90) * 1000, 3),
+                "p99_ms": round(percentile(samples, 99) * 1000, 3),
+                "max_ms": round(max(samples) * 1000, 3),
+            }
+        return data
+
+    def export(self):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _export_loop(self):
+        while not self.stopped.wait(self.interval):
+            self.export()
+
+    def close(self):
+        self.stopped.set()
+        self.export()
+        if self.profile:
+            self.profile.disable()
+            self.profile.dump_stats(self.cprofile_path)
+        print(f"[INFO] Profil saqlandi: {self.path}")
@@ -0,0 +1,112 @@
+import pygame
+
+from const import *
+from assets import Assets
+
+class Renderer:
+
+    def __init__(self, game, screen):
+        self.game = game
+        self.screen = screen
+        self.clock = pygame.time.Clock()
+        # pre-rendered background and labels, one per theme index
+        self.layers = {}
+        self.board_rect = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        self.dirty = []
+        self.flips = []
+        self.drag_rect = None
+
+    def background(self):
+        config = self.game.config
+        layer = self.layers.get(config.idx)
+        if layer is None:
+            layer = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.game.show_bg(layer)
+            self.layers[config.idx] = layer
+        return layer
+
+    # dirty marking
+
+    def mark(self, rect):
+        rect = pygame.Rect(rect).clip(self.board_rect)
+        if rect.width and rect.height:
+            self.dirty.append(rect)
+
+    def mark_square(self, row, col):
+        self.mark((col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE))
+
+    def mark_move(self, piece, move, previous=None):
+        # both ends, the last-move trace it replaces, a castling rook and a pawn taken en passant
+        squares = [move.initial, move.final]
+        if previous:
+            squares += [previous.initial, previous.final]
+        for square in squares:
+            self.mark_square(square.row, square.col)
+
+        row, col, final_col = move.initial.row, move.initial.col, move.final.col
+        if piece.name == 'king' and abs(final_col - col) == 2:
+            self.mark_square(row, 7 if final_col > col else 0)
+            self.mark_square(row, 5 if final_col > col else 3)
+        elif piece.name == 'pawn' and final_col != col:
+            self.mark_square(row, final_col)
+
+    def mark_moves(self, piece):
+        # the move hints shown while a piece is dragged
+        for move in piece.moves:
+            self.mark_square(move.final.row, move.final.col)
+
+    def mark_all(self):
+        self.dirty = [self.board_rect.copy()]
+
+    def mark_hover(self, row, col):
+        old = self.game.hovered_sqr
+        self.game.set_hover(row, col)
+        if old is not self.game.hovered_sqr:
+            if old:
+                self.mark_square(old.row, old.col)
+            self.mark_square(row, col)
+
+    def flip(self, rect):
+        # area drawn by someone else that only needs to reach the display
+        self.flips.append(pygame.Rect(rect))
+
+    # blit methods
+
+    def update(self):
+        game = self.game
+        screen = self.screen
+        dragger = game.dragger
+
+        if dragger.dragging:
+            img = Assets.image(dragger.piece.color, dragger.piece.name, 128)
+            rect = img.get_rect(center=(dragger.mouseX, dragger.mouseY))
+            if rect != self.drag_rect:
+                if self.drag_rect:
+                    self.mark(self.drag_rect)
+                self.mark(rect)
+                self.drag_rect = rect
+        elif self.drag_rect:
+            self.mark(self.drag_rect)
+            self.drag_rect = None
+
+        if not self.dirty and not self.flips:
+            return
+
+        if self.dirty:
+            layer = self.background()
+            for rect in self.dirty:
+                screen.set_clip(rect)
+                screen.blit(layer, rect, rect)
+                game.show_last_move(screen)
+                game.show_moves(screen)
+                game.show_pieces(screen)
+                game.show_hover(screen)
+
+            if dragger.dragging:
+                screen.set_clip(self.board_rect)
+                dragger.update_blit(screen)
+            screen.set_clip(None)
+
+        pygame.display.update(self.dirty + self.flips)
+        self.dirty = []
+        self.flips = []
@@ -0,0 +1,270 @@
+import argparse
+import time
+
+from core import BitBoard, START_FEN, Pawn, Knight, Bishop, Rook, Queen
+from core.bitboard import PAWN, QUEEN, WHITE, bits, uci
+
+MATE = 100000
+INF = 1000000
+MAX_PLY = 64
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# centipawns from Piece.value, the king is never traded so it counts nothing
+VALUES = [round(cls('white').value * 100) for cls in (Pawn, Knight, Bishop, Rook, Queen)] + [0]
+
+# piece-square tables from white's side, rank 8 first
+PST = [
+    [0, 0, 0, 0, 0, 0, 0, 0,
+     50, 50, 50, 50, 50, 50, 50, 50,
+     10, 10, 20, 30, 30, 20, 10, 10,
+     5, 5, 10, 25, 25, 10, 5, 5,
+     0, 0, 0, 20, 20, 0, 0, 0,
+     5, -5, -10, 0, 0, -10, -5, 5,
+     5, 10, 10, -20, -20, 10, 10, 5,
+     0, 0, 0, 0, 0, 0, 0, 0],
+    [-50, -40, -30, -30, -30, -30, -40, -50,
+     -40, -20, 0, 0, 0, 0, -20, -40,
+     -30, 0, 10, 15, 15, 10, 0, -30,
+     -30, 5, 15, 20, 20, 15, 5, -30,
+     -30, 0, 15, 20, 20, 15, 0, -30,
+     -30, 5, 10, 15, 15, 10, 5, -30,
+     -40, -20, 0, 5, 5, 0, -20, -40,
+     -50, -40, -30, -30, -30, -30, -40, -50],
+    [-20, -10, -10, -10, -10, -10, -10, -20,
+     -10, 0, 0, 0, 0, 0, 0, -10,
+     -10, 0, 5, 10, 10, 5, 0, -10,
+     -10, 5, 5, 10, 10, 5, 5, -10,
+     -10, 0, 10, 10, 10, 10, 0, -10,
+     -10, 10, 10, 10, 10, 10, 10, -10,
+     -10, 5, 0, 0, 0, 0, 5, -10,
+     -20, -10, -10, -10, -10, -10, -10, -20],
+    [0, 0, 0, 0, 0, 0, 0, 0,
+     5, 10, 10, 10, 10, 10, 10, 5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     -5, 0, 0, 0, 0, 0, 0, -5,
+     0, 0, 0, 5, 5, 0, 0, 0],
+    [-20, -10, -10, -5, -5, -10, -10, -20,
+     -10, 0, 0, 0, 0, 0, 0, -10,
+     -10, 0, 5, 5, 5, 5, 0, -10,
+     -5, 0, 5, 5, 5, 5, 0, -5,
+     0, 0, 5, 5, 5, 5, 0, -5,
+     -10, 5, 5, 5, 5, 5, 0, -10,
+     -10, 0, 5, 0, 0, 0, 0, -10,
+     -20, -10, -10, -5, -5, -10, -10, -20],
+    [-30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -30, -40, -40, -50, -50, -40, -40, -30,
+     -20, -30, -30, -40, -40, -30, -30, -20,
+     -10, -20, -20, -20, -20, -20, -20, -10,
+     20, 20, 0, 0, 0, 0, 20, 20,
+     20, 30, 10, 0, 0, 10, 30, 20],
+]
+
+# material plus position for each of the 12 pieces on each square, signed for white
+SCORES = ([[VALUES[kind] + PST[kind][sq ^ 56] for sq in range(64)] for kind in range(6)]
+          + [[-VALUES[kind] - PST[kind][sq] for sq in range(64)] for kind in range(6)])
+
+class SearchTimeout(Exception):
+    pass
+
+class Searcher:
+
+    def __init__(self, tt_size=1 << 20):
+        self.tt = {}
+        self.tt_size = tt_size
+        self.nodes = 0
+        self.elapsed = 0.0
+
+    def search(self, fen, time_limit=1.0, max_depth=MAX_PLY):
+        # iterative deepening, returns (move, score, depth) for the side to move
+        board = BitBoard(fen)
+        moves = board.legal_moves()
+        if not moves:
+            return None, 0, 0
+
+        start = time.time()
+        self.deadline = start + time_limit
+        self.nodes = 0
+        self.killers = [[0, 0] for ply in range(MAX_PLY + 1)]
+        self.history = [[0] * 64 for piece in range(12)]
+        if len(self.tt) > self.tt_size:
+            self.tt.clear()
+
+        self.root_best = moves[0]
+        best, score, depth = moves[0], 0, 0
+        for d in range(1, max_depth + 1):
+            try:
+                score = self._negamax(board, d, -INF, INF, 0)
+            except SearchTimeout:
+                # a move that already beat the previous best in the unfinished iteration is kept
+                best = self.root_best
+                break
+            best, depth = self.root_best, d
+            if abs(score) >= MATE - MAX_PLY or len(moves) == 1:
+                break
+
+        self.elapsed = time.time() - start
+        return best, score, depth
+
+    def nps(self):
+        return self.nodes / max(self.elapsed, 1e-9)
+
+    # evaluation
+
+    def evaluate(self, board):
+        score = 0
+        for piece in range(12):
+            table = SCORES[piece]
+            for sq in bits(board.bb[piece]):
+                score += table[sq]
+        return score if board.turn == WHITE else -score
+
+    # search
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and time.time() > self.deadline:
+            raise SearchTimeout()
+        if ply and (board.halfmove >= 100 or board.is_repetition(2)):
+            return 0
+
+        in_check = board.in_check()
+        if in_check:
+            depth += 1
+        if depth <= 0 or ply >= MAX_PLY:
+            return self._quiesce(board, alpha, beta, ply)
+
+        tt_move = 0
+        entry = self.tt.get(board.key)
+        if entry:
+            e_depth, e_score, e_flag, tt_move = entry
+            if ply and e_depth >= depth:
+                e_score = self._from_tt(e_score, ply)
+                if (e_flag == EXACT or (e_flag == LOWER and e_score >= beta)
+                        or (e_flag == UPPER and e_score <= alpha)):
+                    return e_score
+
+        moves = board.legal_moves()
+        if not moves:
+            return -MATE + ply if in_check else 0
+
+        start_alpha = alpha
+        best, best_move = -INF, 0
+        for move in self._order(board, moves, tt_move, ply):
+            board.push(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if ply == 0:
+                        self.root_best = move
+                    if alpha >= beta:
+                        if not self._is_capture(board, move):
+                            self._remember_quiet(board, move, depth, ply)
+                        break
+
+        flag = UPPER if best <= start_alpha else LOWER if best >= beta else EXACT
+        self.tt[board.key] = (depth, self._to_tt(best, ply), flag, best_move)
+        return best
+
+    def _quiesce(self, board, alpha, beta, ply):
+        self.nodes += 1
+        if not self.nodes & 1023 and time.time() > self.deadline:
+            raise SearchTimeout()
+
+        stand = self.evaluate(board)
+        if stand >= beta:
+            return stand
+        alpha = max(alpha, stand)
+
+        captures = [m for m in board.legal_moves() if self._is_capture(board, m) or m >> 12 == QUEEN]
+        captures.sort(key=lambda m: self._mvv_lva(board, m), reverse=True)
+        for move in captures:
+            board.push(move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    # move ordering: tt move, captures by MVV-LVA, promotions, killers, history
+
+    def _order(self, board, moves, tt_move, ply):
+        killers = self.killers[ply]
+        history = self.history
+        mailbox = board.mailbox
+
+        def rank(move):
+            if move == tt_move:
+                return 1 << 30
+            if self._is_capture(board, move):
+                return (1 << 24) + self._mvv_lva(board, move)
+            if move >> 12 == QUEEN:
+                return 1 << 23
+            if move == killers[0]:
+                return (1 << 22) + 1
+            if move == killers[1]:
+                return 1 << 22
+            return history[mailbox[move & 63]][move >> 6 & 63]
+
+        return sorted(moves, key=rank, reverse=True)
+
+    def _is_capture(self, board, move):
+        to = move >> 6 & 63
+        return board.mailbox[to] >= 0 or (to == board.ep and board.mailbox[move & 63] % 6 == PAWN)
+
+    def _mvv_lva(self, board, move):
+        victim = board.mailbox[move >> 6 & 63]
+        victim = PAWN if victim < 0 else victim % 6
+        return VALUES[victim] * 8 - board.mailbox[move & 63] % 6
+
+    def _remember_quiet(self, board, move, depth, ply):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        row = self.history[board.mailbox[move & 63]]
+        row[move >> 6 & 63] += depth * depth
+        if row[move >> 6 & 63] >= 1 << 21:
+            for piece_row in self.history:
+                for sq in range(64):
+                    piece_row[sq] >>= 1
+
+    # mate scores are stored relative to the node, not the root
+
+    def _to_tt(self, score, ply):
+        if score >= MATE - MAX_PLY:
+            return score + ply
+        if score <= -MATE + MAX_PLY:
+            return score - ply
+        return score
+
+    def _from_tt(self, score, ply):
+        if score >= MATE - MAX_PLY:
+            return score - ply
+        if score <= -MATE + MAX_PLY:
+            return score + ply
+        return score
+
+def main():
+    parser = argparse.ArgumentParser(description='Search a position with the built-in engine')
+    parser.add_argument('fen', nargs='?', default=START_FEN)
+    parser.add_argument('--time', type=float, default=5.0, help='seconds')
+    parser.add_argument('--depth', type=int, default=MAX_PLY)
+    args = parser.parse_args()
+
+    searcher = Searcher()
+    move, score, depth = searcher.search(args.fen, args.time, args.depth)
+    print(f"[SEARCH] {uci(move) if move is not None else '-'} | score {score} | depth {depth} | "
+          f"{searcher.nodes} nodes | {searcher.elapsed:.2f}s | {searcher.nps():,.0f} nps")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+import argparse
+import atexit
+import os
+import random
+import time
+from multiprocessing import Pool
+
+import chess
+import chess.engine
+import chess.pgn
+
+from core import Board, Square, Move
+from archive import ArchiveWriter
+
+STOCKFISH_PATH = "/usr/games/stockfish"
+
+# short main lines, one is picked at random for every game
+OPENINGS = [
+    "e4 e5 Nf3 Nc6 Bb5",
+    "e4 e5 Nf3 Nc6 Bc4",
+    "e4 c5 Nf3 d6 d4",
+    "e4 c5 Nc3 Nc6",
+    "e4 e6 d4 d5",
+    "e4 c6 d4 d5",
+    "d4 d5 c4 e6",
+    "d4 d5 c4 c6",
+    "d4 Nf6 c4 g6 Nc3 Bg7",
+    "d4 Nf6 c4 e6 Nc3 Bb4",
+    "c4 e5 Nc3 Nf6",
+    "Nf3 d5 g3 Nf6 Bg2",
+]
+
+PROMOTION_NAMES = {chess.QUEEN: 'queen', chess.ROOK: 'rook', chess.BISHOP: 'bishop', chess.KNIGHT: 'knight'}
+
+def load_openings(path):
+    # a PGN file (main lines) or a text file with one line of SAN moves per opening
+    if path is None:
+        return OPENINGS
+    openings = []
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.pgn'):
+            while True:
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                board = game.board()
+                openings.append(' '.join(board.san_and_push(move) for move in game.mainline_moves()))
+        else:
+            openings = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    return openings
+
+def side_settings(depth, seconds, skill, elo):
+    limit = chess.engine.Limit(depth=depth) if depth else chess.engine.Limit(time=seconds)
+    options = {}
+    if skill is not None:
+        options["Skill Level"] = skill
+    if elo is not None:
+        options["UCI_LimitStrength"] = True
+        options["UCI_Elo"] = elo
+    return limit, options
+
+# one engine per worker process
+
+_engine = None
+
+def _init_worker(engine_path):
+    global _engine
+    _engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+    atexit.register(_engine.quit)
+
+def _apply(board, move):
+    # the same path as the GUI's AI move: validate on our Board, then play it
+    initial = Square.at(7 - chess.square_rank(move.from_square), chess.square_file(move.from_square))
+    final = Square.at(7 - chess.square_rank(move.to_square), chess.square_file(move.to_square))
+    piece = board.squares[initial.row][initial.col].piece
+    board_move = Move(initial, final, PROMOTION_NAMES.get(move.promotion))
+    if not board.valid_move(piece, board_move):
+        raise ValueError(f"Illegal move {move.uci()}")
+    board.move(piece, board_move)
+
+def _play_game(task):
+    index, opening, sides, max_plies = task
+    start = time.time()
+    thinking = 0.0
+
+    board = Board()
+    position = chess.Board()
+    game = chess.pgn.Game()
+    game.headers["Event"] = "Self-play"
+    game.headers["Round"] = str(index + 1)
+    game.headers["Opening"] = opening
+    node = game
+
+    for san in opening.split():
+        move = position.parse_san(san)
+        _apply(board, move)
+        position.push(move)
+        node = node.add_variation(move)
+
+    while not position.is_game_over(claim_draw=True) and position.ply() < max_plies:
+        limit, options = sides[position.turn]
+        t = time.time()
+        move = _engine.play(position, limit, options=options).move
+        thinking += time.time() - t
+        if move is None:
+            break
+        _apply(board, move)
+        position.push(move)
+        node = node.add_variation(move)
+
+    if board.fen() != position.fen(en_passant='fen'):
+        raise ValueError(f"Board diverged from {position.fen()}")
+
+    game.headers["Result"] = position.result(claim_draw=True)
+    game.headers["PlyCount"] = str(position.ply())
+    ucis = [move.uci() for move in position.move_stack]
+    return index, str(game), ucis, os.getpid(), time.time() - start, thinking
+
+def run(games, out_path, engine_path=STOCKFISH_PATH, workers=1, white=None, black=None,
+        openings=None, seed=None, max_plies=300, archive_path=None):
+    white = white or side_settings(None, 0.1, None, None)
+    black = black or white
+    sides = {chess.WHITE: white, chess.BLACK: black}
+    openings = openings or OPENINGS
+    rng = random.Random(seed)
+    tasks = [(i, rng.choice(openings), sides, max_plies) for i in range(games)]
+
+    busy = {}
+    start = time.time()
+    # the moves alone, 2 bytes a ply, next to the PGN
+    archive = ArchiveWriter(archive_path) if archive_path else None
+    with open(out_path, 'a', encoding='utf-8') as out, Pool(workers, _init_worker, (engine_path,)) as pool:
+        for done, (index, pgn, ucis, pid, duration, thinking) in enumerate(pool.imap_unordered(_play_game, tasks), 1):
+            out.write(pgn + '\n\n')
+            out.flush()
+            if archive:
+                archive.add(ucis)
+            total, engine = busy.get(pid, (0.0, 0.0))
+            busy[pid] = (total + duration, engine + thinking)
+            elapsed = time.time() - start
+            print(f"[INFO] {done}/{games} o'yin | {done * 3600 / max(elapsed, 1e-9):.0f} o'yin/soat")
+
+    if archive:
+        archive.close()
+    elapsed = time.time() - start
+    for n, (pid, (total, engine)) in enumerate(sorted(busy.items()), 1):
+        print(f"[INFO] worker {n}: band {100 * total / elapsed:.0f}% | engine {100 * engine / elapsed:.0f}%")
+    return busy
+
+def main():
+    parser = argparse.ArgumentParser(description='Play engine-vs-engine games in parallel into a PGN file')
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('-o', '--output', default='selfplay.pgn')
+    parser.add_argument('--engine', default=STOCKFISH_PATH)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--openings', help='PGN file or text file with one SAN line per opening')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--max-plies', type=int, default=300)
+    parser.add_argument('--archive', help='also write the games to <archive>.bin/.idx')
+    for side in ('white', 'black'):
+        parser.add_argument(f'--{side}-depth', type=int)
+        parser.add_argument(f'--{side}-time', type=float, default=0.1, help='seconds per move')
+        parser.add_argument(f'--{side}-skill', type=int, help='Skill Level 0-20')
+        parser.add_argument(f'--{side}-elo', type=int, help='UCI_Elo, limits strength')
+    args = parser.parse_args()
+
+    white = side_settings(args.white_depth, args.white_time, args.white_skill, args.white_elo)
+    black = side_settings(args.black_depth, args.black_time, args.black_skill, args.black_elo)
+    run(args.games, args.output, args.engine, args.workers, white, black,
+        load_openings(args.openings), args.seed, args.max_plies, args.archive)
+
+if __name__ == '__main__':
+    main()
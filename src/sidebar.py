@@ -0,0 +1,73 @@
+import pygame
+
+from const import *
+from assets import Assets
+
+class Sidebar:
+
+    BG = (245, 245, 245)
+    ENTRY_HEIGHT = 47
+    # older entries are only kept on disk, in the game log
+    LIMIT = 200
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.font = Assets.font("Arial", 20)
+        self.surface = pygame.Surface(self.rect.size).convert()
+        self.entries = []
+        # number of newest entries scrolled out of view
+        self.scroll = 0
+        self.stale = True
+        self.changed = True
+
+    def per_page(self):
+        return (self.rect.height - 10) // self.ENTRY_HEIGHT
+
+    # log methods
+
+    def append(self, item):
+        move_line = f"{item['move']}: {item['comment']}"
+        suggestion_line = f"{item.get('suggestion', '')}"
+        move_surface = self.font.render(move_line, True, (0, 0, 0))
+        suggestion_surface = self.font.render(suggestion_line, True, (100, 100, 100))
+        self.entries.append((move_surface, suggestion_surface))
+        if len(self.entries) > self.LIMIT:
+            del self.entries[0]
+        # keep an older page in view while the user is scrolled back
+        if self.scroll:
+            self.scroll = min(self.scroll + 1, len(self.entries) - self.per_page())
+        self.stale = True
+
+    def clear(self):
+        self.entries = []
+        self.scroll = 0
+        self.stale = True
+
+    def scroll_by(self, lines):
+        scroll = max(0, min(self.scroll + lines, len(self.entries) - self.per_page()))
+        if scroll != self.scroll:
+            self.scroll = scroll
+            self.stale = True
+
+    # blit methods
+
+    def compose(self):
+        self.surface.fill(self.BG)
+        end = len(self.entries) - self.scroll
+        y_offset = 10
+        for move_surface, suggestion_surface in self.entries[max(0, end - self.per_page()):end]:
+            self.surface.blit(move_surface, (10, y_offset))
+            y_offset += 22
+            self.surface.blit(suggestion_surface, (20, y_offset))
+            y_offset += 25
+        self.stale = False
+        self.changed = True
+
+    def show(self, surface):
+        if self.stale:
+            self.compose()
+        if not self.changed:
+            return False
+        surface.blit(self.surface, self.rect)
+        self.changed = False
+        return True
@@ -0,0 +1,99 @@
+import os
+from collections import OrderedDict
+
+import chess
+import chess.syzygy
+
+TABLEBASE_PATH = 'syzygy'
+# below mate scores, above anything a search reports for material
+TB_WIN = 9000
+CACHE_SIZE = 100000
+
+class Tablebase:
+
+    # exact WDL/DTZ answers for positions with at most `pieces` men, probes are cached
+    def __init__(self, path=TABLEBASE_PATH, cache_size=CACHE_SIZE):
+        self.path = path
+        self.tables = chess.syzygy.Tablebase()
+        self.tables.add_directory(path)
+        self.pieces = max((len(name) - 1 for name in self.tables.wdl), default=0)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.hits = self.misses = 0
+
+    @classmethod
+    def open(cls, path=TABLEBASE_PATH):
+        # None without table files, the engine then answers every endgame
+        if not path or not os.path.isdir(path):
+            return None
+        tablebase = cls(path)
+        if not tablebase.pieces:
+            tablebase.close()
+            return None
+        print(f"[INFO] Syzygy jadvallari: {path} ({tablebase.pieces} tagacha dona)")
+        return tablebase
+
+    def covers(self, board):
+        return chess.popcount(board.occupied) <= self.pieces and not board.castling_rights
+
+    def probe(self, board):
+        # (wdl, dtz) for the side to move, None if a table is missing
+        key = board.epd()
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        self.misses += 1
+
+        try:
+            wdl = self.tables.probe_wdl(board)
+            try:
+                dtz = self.tables.probe_dtz(board)
+            except KeyError:
+                dtz = 0
+            result = (wdl, dtz)
+        except KeyError:
+            result = None
+
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result
+
+    def score(self, board):
+        probe = self.probe(board)
+        if probe is None:
+            return None
+        wdl, dtz = probe
+        # cursed wins and blessed losses are draws under the 50-move rule
+        if wdl == 2:
+            return TB_WIN - abs(dtz)
+        if wdl == -2:
+            return -TB_WIN + abs(dtz)
+        return 0
+
+    def analyse(self, board):
+        # the same shape as Analyzer.analyse, the best move scored over its replies
+        if not self.covers(board):
+            return None
+        score = self.score(board)
+        if score is None:
+            return None
+
+        best = None
+        for move in board.legal_moves:
+            board.push(move)
+            child = self.score(board)
+            board.pop()
+            if child is None:
+                return None
+            if best is None or -child > best[0]:
+                best = (-child, move)
+
+        if best is not None:
+            score = best[0]
+        pv = [best[1]] if best else []
+        return {"score": score, "pv": pv, "lines": [(score, pv)], "tablebase": True}
+
+    def close(self):
+        self.tables.close()
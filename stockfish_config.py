@@ -3,22 +3,61 @@
 STOCKFISH_PATH = "/path/to/stockfish"  # Stockfish'ning aniq yo'lini kiriting
 ELO_LEVEL = 1000  # Stockfish'ning kuch darajasi
 """
+import os
+import sys
+
 import chess
 from stockfish import Stockfish
 from voice_assistant.speak import speak_uz
 
-stockfish = Stockfish(path="/usr/games/stockfish")
-stockfish.set_skill_level(5)
+STOCKFISH_DEPTH = 15
+SKILL_LEVEL = 5
+# a weakened engine's best move must never answer the GUI's full-strength 'depth' lookups
+CACHE_KIND = f'depth-skill{SKILL_LEVEL}'
+
+stockfish = Stockfish(path="/usr/games/stockfish", depth=STOCKFISH_DEPTH)
+stockfish.set_skill_level(SKILL_LEVEL)
 board = chess.Board()
+cache = None
+
+def _cache():
+    # opened on first use, importing this module creates no files
+    global cache
+    if cache is None:
+        src = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+        if src not in sys.path:
+            sys.path.insert(0, src)
+        from analysis_cache import AnalysisCache
+        cache = AnalysisCache()
+    return cache
+
+def analyse_position(position):
+    # cached like the GUI analysis: score from the side to move, pv as chess.Move
+    key = position.epd()
+    result = _cache().get(key, CACHE_KIND, STOCKFISH_DEPTH)
+    if result is None:
+        stockfish.set_fen_position(position.fen())
+        best_move = stockfish.get_best_move()
+        evaluation = stockfish.get_evaluation()
+        value = evaluation.get('value', 0)
+        if evaluation.get('type') == 'mate':
+            value = 10000 - value if value > 0 else -10000 - value
+        score = value if position.turn == chess.WHITE else -value
+        pv = [chess.Move.from_uci(best_move)] if best_move else []
+        result = {"score": score, "pv": pv, "lines": [(score, pv)]}
+        _cache().put(key, CACHE_KIND, STOCKFISH_DEPTH, 1, result)
+    return result
+
+def white_score(position, result):
+    return result["score"] if position.turn == chess.WHITE else -result["score"]
 
 def evaluate_move(move_uci):
-    stockfish.set_fen_position(board.fen())
-    best_move = stockfish.get_best_move()
-    score_before = stockfish.get_evaluation().get('value', 0)
+    before = analyse_position(board)
+    best_move = before["pv"][0].uci() if before["pv"] else None
+    score_before = white_score(board, before)
 
     board.push_uci(move_uci)
-    stockfish.set_fen_position(board.fen())
-    score_after = stockfish.get_evaluation().get('value', 0)
+    score_after = white_score(board, analyse_position(board))
     diff = score_after - score_before
 
     if move_uci == best_move: